@@ -1,12 +1,6 @@
 import asyncio
 from quart import Quart
 
-from dedi_gateway.etc.consts import SCHEDULER
-from dedi_gateway.etc.utils import scheduler_add_initial_jobs
-from dedi_gateway.model.network_message.registry import NetworkMessageRegistry
-from dedi_gateway.model.network_interface import establish_all_connections
-from dedi_gateway.view import management_blueprint, service_blueprint
-
 
 def create_app() -> Quart:
     """
@@ -14,22 +8,48 @@ def create_app() -> Quart:
 
     :return: Configured Quart application instance
     """
+    from dedi_gateway.cache import bind_request_broker
+    from dedi_gateway.view import management_blueprint, service_blueprint
+
     app = Quart(__name__)
 
     # Register blueprints
     app.register_blueprint(management_blueprint, url_prefix='/manage')
     app.register_blueprint(service_blueprint, url_prefix='/service')
 
-    NetworkMessageRegistry.load_packages()
+    @app.before_request
+    async def bind_request_context():
+        bind_request_broker()
+
+    @app.before_websocket
+    async def bind_websocket_context():
+        bind_request_broker()
 
     @app.before_serving
     async def startup():
+        from dedi_gateway.database import get_active_db
+        from dedi_gateway.etc.consts import SCHEDULER
+        from dedi_gateway.etc.utils import scheduler_add_initial_jobs
+        from dedi_gateway.kms import get_active_kms
+        from dedi_gateway.model.network_interface import establish_all_connections
+        from dedi_gateway.model.network_message.registry import NetworkMessageRegistry
+
+        # Read the message packages off the event loop while the scheduler starts
+        packages_loading = asyncio.create_task(
+            asyncio.to_thread(NetworkMessageRegistry.load_packages)
+        )
+
+        # Start generating RSA keys in the background for new networks
+        get_active_kms().warm_up_key_pool()
+
         scheduler_add_initial_jobs()
         if not SCHEDULER.running:
             SCHEDULER.start()
         else:
             SCHEDULER.resume()
 
+        await packages_loading
+        await get_active_db().ensure_indexes()
         await establish_all_connections()
 
     @app.route('/health', methods=['GET'])
@@ -1,2 +1,3 @@
 from .cache import get_active_cache
-from .message_broker import MessageBroker, get_active_broker
+from .message_broker import MessageBroker, get_active_broker, bind_request_broker, \
+    get_request_broker
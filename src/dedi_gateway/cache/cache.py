@@ -1,3 +1,5 @@
+import functools
+
 from dedi_gateway.etc.consts import SERVICE_CONFIG
 from dedi_gateway.etc.errors import ConfigurationParsingException
 from dedi_gateway.model.route import Route
@@ -7,6 +9,8 @@ class Cache:
     """
     A class for hot data caching and multiprocess state persistence.
     """
+    CHALLENGE_TTL = 300
+
     async def save_challenge(self,
                              nonce: str,
                              difficulty: int,
@@ -58,19 +62,13 @@ class Cache:
         raise NotImplementedError
 
 
-_active_cache: Cache | None = None
-
-
+@functools.cache
 def get_active_cache() -> Cache:
     """
-    Return the active cache set by configuration
+    Return the active cache set by configuration. The instance is created on
+    the first call and reused afterwards.
     :return: Cache instance based on the configuration.
     """
-    global _active_cache
-
-    if _active_cache is not None:
-        return _active_cache
-
     if SERVICE_CONFIG.cache_driver == 'redis':
         # TODO: Implement RedisCache
         raise NotImplementedError(
@@ -79,9 +77,7 @@ def get_active_cache() -> Cache:
     elif SERVICE_CONFIG.cache_driver == 'memory':
         from .memory import MemoryCache
 
-        _active_cache = MemoryCache()
-
-        return _active_cache
+        return MemoryCache()
     else:
         raise ConfigurationParsingException(
             f'Unsupported cache driver: {SERVICE_CONFIG.broker_driver}'
@@ -1,6 +1,9 @@
 import time
+import logging
+import heapq
+from collections import OrderedDict
 
-from dedi_gateway.etc.consts import LOGGER
+from dedi_gateway.etc.consts import SERVICE_CONFIG, LOGGER
 from dedi_gateway.model.route import Route
 from ..cache import Cache
 
@@ -10,23 +13,43 @@ class MemoryCache(Cache):
     An in-memory implementation of the Cache for hot data caching and
     multiprocess state persistence.
     """
-    _challenges: dict[str, dict] = {}
-    _routes: dict[str, dict] = {}
+    _challenges: dict[str, tuple[int, float]] = {}
+    _expiry_heap: list[tuple[float, str]] = []
+    _routes: OrderedDict[str, dict] = OrderedDict()
+    _MAX_ROUTES = SERVICE_CONFIG.cache_max_routes
+
+    @staticmethod
+    def _purge_expired():
+        """
+        Evict all challenges whose TTL has passed, in order of expiry.
+        """
+        now = time.monotonic()
+        heap = MemoryCache._expiry_heap
+
+        while heap and heap[0][0] <= now:
+            expires_at, nonce = heapq.heappop(heap)
+            challenge = MemoryCache._challenges.get(nonce)
+
+            # The nonce may have been saved again since this entry was pushed
+            if challenge and challenge[1] <= expires_at:
+                del MemoryCache._challenges[nonce]
 
     async def save_challenge(self,
                              nonce: str,
                              difficulty: int,
                              ):
-        LOGGER.debug(
-            'Saving challenge to memory cache: nonce=%s, difficulty=%d',
-            nonce,
-            difficulty
-        )
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                'Saving challenge to memory cache: nonce=%s, difficulty=%d',
+                nonce,
+                difficulty
+            )
 
-        MemoryCache._challenges[nonce] = {
-            'difficulty': difficulty,
-            'timestamp': time.time(),
-        }
+        MemoryCache._purge_expired()
+
+        expires_at = time.monotonic() + self.CHALLENGE_TTL
+        MemoryCache._challenges[nonce] = (difficulty, expires_at)
+        heapq.heappush(MemoryCache._expiry_heap, (expires_at, nonce))
 
     async def get_challenge(self,
                             nonce: str,
@@ -34,18 +57,21 @@ class MemoryCache(Cache):
         challenge = MemoryCache._challenges.get(nonce, None)
 
         if challenge:
-            if challenge['timestamp'] + 300 > int(time.time()):
-                LOGGER.debug(
-                    'Challenge found in memory cache: nonce=%s, difficulty=%d',
-                    nonce,
-                    challenge['difficulty']
-                )
-                return challenge['difficulty']
+            difficulty, expires_at = challenge
+
+            if expires_at > time.monotonic():
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug(
+                        'Challenge found in memory cache: nonce=%s, difficulty=%d',
+                        nonce,
+                        difficulty
+                    )
+                return difficulty
 
             LOGGER.warning(
                 'Expired challenge accessed in memory cache: nonce=%s, difficulty=%d',
                 nonce,
-                challenge['difficulty']
+                difficulty
             )
 
         return None
@@ -53,13 +79,26 @@ class MemoryCache(Cache):
     async def save_route(self,
                          route: Route,
                          ):
-        LOGGER.debug(
-            'Saving route to memory cache: node_id=%s, route=%s',
-            route.node_id,
-            route.to_dict()
-        )
+        route_data = route.to_dict()
+
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                'Saving route to memory cache: node_id=%s, route=%s',
+                route.node_id,
+                route_data
+            )
+
+        MemoryCache._routes[route.node_id] = route_data
+        MemoryCache._routes.move_to_end(route.node_id)
 
-        MemoryCache._routes[route.node_id] = route.to_dict()
+        if len(MemoryCache._routes) > MemoryCache._MAX_ROUTES:
+            evicted_node_id, _ = MemoryCache._routes.popitem(last=False)
+
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(
+                    'Evicted least recently used route from memory cache: node_id=%s',
+                    evicted_node_id
+                )
 
     async def get_route(self,
                         node_id: str,
@@ -67,11 +106,14 @@ class MemoryCache(Cache):
         route_data = MemoryCache._routes.get(node_id, None)
 
         if route_data:
-            LOGGER.debug(
-                'Route found in memory cache: node_id=%s, route=%s',
-                node_id,
-                route_data
-            )
+            MemoryCache._routes.move_to_end(node_id)
+
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(
+                    'Route found in memory cache: node_id=%s, route=%s',
+                    node_id,
+                    route_data
+                )
 
             return Route.from_dict(route_data)
 
@@ -88,10 +130,11 @@ class MemoryCache(Cache):
         if node_id in MemoryCache._routes:
             del MemoryCache._routes[node_id]
 
-            LOGGER.debug(
-                'Route deleted from memory cache: node_id=%s',
-                node_id
-            )
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(
+                    'Route deleted from memory cache: node_id=%s',
+                    node_id
+                )
             return True
 
         LOGGER.warning(
@@ -1,6 +1,9 @@
 import asyncio
+from itertools import islice
+from collections import deque, OrderedDict
 from typing import AsyncGenerator
 
+from dedi_gateway.etc.consts import LOGGER
 from dedi_gateway.etc.errors import MessageBrokerTimeoutException
 from ..message_broker import MessageBroker
 
@@ -10,9 +13,8 @@ class AsyncQueue:
     A thread-safe asynchronous queue for data exchange.
     """
     def __init__(self):
-        self._queue = []
+        self._queue = deque()
         self._condition = asyncio.Condition()
-        self._lock = asyncio.Lock()
 
     def __len__(self):
         return len(self._queue)
@@ -22,75 +24,137 @@ class AsyncQueue:
         Asynchronously put an item in the back of the queue
         """
         async with self._condition:
-            async with self._lock:
-                self._queue.append(item)
-            self._condition.notify_all()
+            self._queue.append(item)
+            # Every waiter consumes exactly one item, so wake only one of them
+            self._condition.notify(1)
 
-    async def get(self):
+    async def put_front(self, item):
         """
-        Asynchronously get an item from the front of the queue
+        Asynchronously put an item in the front of the queue, to be taken next
         """
         async with self._condition:
-            while not self._queue:
-                await self._condition.wait()
-            async with self._lock:
-                return self._queue.pop(0)
+            self._queue.appendleft(item)
+            self._condition.notify(1)
 
-    async def pop_by_index(self, index: int):
+    async def get(self):
         """
-        Asynchronously pop an item from the queue by index and return it
+        Asynchronously get an item from the front of the queue
         """
         async with self._condition:
-            while True:
-                async with self._lock:
-                    if index < len(self._queue):
-                        return self._queue.pop(index)
+            while not self._queue:
                 await self._condition.wait()
+            return self._queue.popleft()
 
 
 class MemoryMessageBroker(MessageBroker):
     """
     An in-memory implementation of the MessageBroker for caching and retrieving messages.
     """
-    _messages = {}
-    _responses = {}
+    MAX_INFLIGHT_RESPONSES = 10000
 
-    async def get_message(self, node_id: str) -> dict | None:
-        queue: AsyncQueue | None = MemoryMessageBroker._messages.get(node_id, None)
+    _messages: dict[str, AsyncQueue] = {}
+    _delivered: dict[tuple[str, str], dict] = {}
+    _responses: OrderedDict[str, AsyncQueue] = OrderedDict()
+    _awaited_responses: set[str] = set()
 
-        counter = 0
-        while counter < self.DRIVER_TIMEOUT * 2:
-            if queue:
-                try:
-                    message = await queue.pop_by_index(0)
-                    return message
-                except IndexError:
-                    pass
+    @staticmethod
+    def _get_or_create_queue(queues: dict[str, AsyncQueue],
+                             key: str,
+                             ) -> AsyncQueue:
+        """
+        Get the queue stored under a key, creating it if it does not exist yet,
+        so that consumers can wait on a queue before anything is published to it.
+        :param queues: The queue mapping to look up.
+        :param key: The key of the queue.
+        :return: The queue stored under the key.
+        """
+        queue = queues.get(key)
+        if queue is None:
+            queue = AsyncQueue()
+            queues[key] = queue
+
+        return queue
+
+    @classmethod
+    def _get_response_queue(cls, message_id: str) -> AsyncQueue:
+        """
+        Get the response queue for a message, creating it if needed. Queues are
+        kept in least recently used order, and once there are too many the
+        oldest ones nobody is waiting on are dropped.
+        :param message_id: The ID of the message the responses belong to.
+        :return: The response queue for the message.
+        """
+        responses = cls._responses
+        queue = responses.get(message_id)
 
-            await asyncio.sleep(0.5)
+        if queue is not None:
+            responses.move_to_end(message_id)
+            return queue
 
-            if queue is None:
-                queue = MemoryMessageBroker._messages.get(node_id, None)
+        queue = responses[message_id] = AsyncQueue()
+        overflow = len(responses) - cls.MAX_INFLIGHT_RESPONSES
 
-            counter += 1
+        if overflow > 0:
+            # Most likely left behind by a request that never collected its responses
+            evictable = (key for key in responses if key not in cls._awaited_responses)
 
-        return None
+            for evicted_message_id in list(islice(evictable, overflow)):
+                del responses[evicted_message_id]
+
+                LOGGER.warning(
+                    'Too many in-flight response queues, dropped responses for message ID: %s',
+                    evicted_message_id
+                )
+
+        return queue
+
+    async def get_message(self,
+                          node_id: str,
+                          consumer_id: str,
+                          ) -> dict | None:
+        key = (node_id, consumer_id)
+
+        # A message handed out but not acknowledged is delivered again
+        message = MemoryMessageBroker._delivered.get(key)
+        if message is not None:
+            return message
+
+        queue = self._get_or_create_queue(MemoryMessageBroker._messages, node_id)
+
+        try:
+            message = await asyncio.wait_for(queue.get(), timeout=self.DRIVER_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+
+        MemoryMessageBroker._delivered[key] = message
+
+        return message
+
+    async def acknowledge_message(self,
+                                  node_id: str,
+                                  consumer_id: str,
+                                  ):
+        MemoryMessageBroker._delivered.pop((node_id, consumer_id), None)
+
+    async def release_consumer(self,
+                               node_id: str,
+                               consumer_id: str,
+                               ):
+        message = MemoryMessageBroker._delivered.pop((node_id, consumer_id), None)
+
+        if message is not None:
+            queue = self._get_or_create_queue(MemoryMessageBroker._messages, node_id)
+            await queue.put_front(message)
 
     async def publish_message(self, node_id: str, message: dict):
-        queue = MemoryMessageBroker._messages.get(node_id, None)
-        if queue is None:
-            queue = AsyncQueue()
-            MemoryMessageBroker._messages[node_id] = queue
+        queue = self._get_or_create_queue(MemoryMessageBroker._messages, node_id)
 
         await queue.put(message)
 
     async def add_to_response(self,
                               message: dict,
                               ):
-        queue = MemoryMessageBroker._responses.get(message['metadata']['messageId'], None)
-        if queue is None:
-            queue = AsyncQueue()
-            MemoryMessageBroker._responses[message['metadata']['messageId']] = queue
+        queue = self._get_response_queue(message['metadata']['messageId'])
 
         await queue.put(message)
 
@@ -98,27 +162,19 @@ class MemoryMessageBroker(MessageBroker):
                                  message_id: str,
                                  message_count: int = 1,
                                  ) -> AsyncGenerator[dict, None]:
-        queue: AsyncQueue | None = MemoryMessageBroker._responses.get(message_id, None)
-        time_counter = 0
-        message_counter = 0
+        MemoryMessageBroker._awaited_responses.add(message_id)
+        queue = self._get_response_queue(message_id)
 
-        while message_counter < message_count and time_counter < self.DRIVER_TIMEOUT * 2:
-            if queue:
+        try:
+            for _ in range(message_count):
                 try:
-                    response = await queue.pop_by_index(0)
-                    message_counter += 1
-                    time_counter = 0
-                    yield response
-                except IndexError:
-                    pass
-
-            await asyncio.sleep(0.5)
-            time_counter += 1
-
-            if queue is None:
-                queue = MemoryMessageBroker._responses.get(message_id, None)
-
-        if message_counter < message_count:
-            raise MessageBrokerTimeoutException(
-                f'Timeout while waiting for response for message ID: {message_id}'
-            )
+                    response = await asyncio.wait_for(queue.get(), timeout=self.DRIVER_TIMEOUT)
+                except asyncio.TimeoutError as e:
+                    raise MessageBrokerTimeoutException(
+                        f'Timeout while waiting for response for message ID: {message_id}'
+                    ) from e
+
+                yield response
+        finally:
+            MemoryMessageBroker._awaited_responses.discard(message_id)
+            MemoryMessageBroker._responses.pop(message_id, None)
@@ -1,3 +1,5 @@
+import functools
+from contextvars import ContextVar
 from typing import AsyncGenerator
 
 from dedi_gateway.etc.consts import SERVICE_CONFIG
@@ -10,16 +12,45 @@ class MessageBroker:
     """
     DRIVER_TIMEOUT = 60
 
-    async def get_message(self, node_id: str) -> dict | None:
+    async def get_message(self,
+                          node_id: str,
+                          consumer_id: str,
+                          ) -> dict | None:
         """
         Retrieve a message for a specific node. Async blocking operation,
         so if no message is found, it will wait until a message is available or
-        the operation times out.
+        the operation times out. A message that the consumer has not acknowledged
+        yet is returned again.
         :param node_id: The node ID to retrieve the message for.
+        :param consumer_id: A unique ID of the connection consuming the messages.
         :return: A dictionary containing the message data.
         """
         raise NotImplementedError
 
+    async def acknowledge_message(self,
+                                  node_id: str,
+                                  consumer_id: str,
+                                  ):
+        """
+        Acknowledge that the last message returned by get_message to a consumer
+        has been delivered, so it will not be returned again.
+        :param node_id: The node ID the message was retrieved for.
+        :param consumer_id: The ID of the consumer that retrieved the message.
+        """
+        raise NotImplementedError
+
+    async def release_consumer(self,
+                               node_id: str,
+                               consumer_id: str,
+                               ):
+        """
+        Stop consuming messages for a node, returning the consumer's
+        unacknowledged message to the node queue for another consumer.
+        :param node_id: The node ID the messages were retrieved for.
+        :param consumer_id: The ID of the consumer to release.
+        """
+        raise NotImplementedError
+
     async def publish_message(self, node_id: str, message: dict):
         """
         Publish a message to a specific node.
@@ -50,19 +81,13 @@ class MessageBroker:
         raise NotImplementedError
 
 
-_active_broker: MessageBroker | None = None
-
-
+@functools.cache
 def get_active_broker() -> MessageBroker:
     """
-    Return the active message broker set by configuration
+    Return the active message broker set by configuration. The instance is
+    created on the first call and reused afterwards.
     :return: MessageBroker instance based on the configuration.
     """
-    global _active_broker
-
-    if _active_broker is not None:
-        return _active_broker
-
     if SERVICE_CONFIG.cache_driver == 'redis':
         import redis.asyncio as redis
         from .redis_driver import RedisMessageBroker
@@ -74,16 +99,38 @@ def get_active_broker() -> MessageBroker:
         )
 
         RedisMessageBroker.set_client(redis_client)
-        _active_broker = RedisMessageBroker()
 
-        return _active_broker
+        return RedisMessageBroker()
     elif SERVICE_CONFIG.cache_driver == 'memory':
         from .memory import MemoryMessageBroker
 
-        _active_broker = MemoryMessageBroker()
-
-        return _active_broker
+        return MemoryMessageBroker()
     else:
         raise ConfigurationParsingException(
             f'Unsupported message broker driver: {SERVICE_CONFIG.cache_driver}'
         )
+
+
+_request_broker: ContextVar[MessageBroker | None] = ContextVar('request_broker', default=None)
+
+
+def bind_request_broker():
+    """
+    Resolve the active message broker and bind it to the current context,
+    so handlers of the same request can read it without resolving it again.
+    """
+    _request_broker.set(get_active_broker())
+
+
+def get_request_broker() -> MessageBroker:
+    """
+    Return the message broker bound to the current request, falling back to
+    the active broker outside a request context.
+    :return: MessageBroker instance for the current context.
+    """
+    broker = _request_broker.get()
+
+    if broker is None:
+        return get_active_broker()
+
+    return broker
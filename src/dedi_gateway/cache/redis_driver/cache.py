@@ -1,8 +1,8 @@
-import json
 import redis.asyncio as redis
 
 from dedi_gateway.model.route import Route
 from ..cache import Cache
+from .codec import encode, decode
 
 
 class RedisCache(Cache):
@@ -37,14 +37,19 @@ class RedisCache(Cache):
                              ):
         await self.db.set(
             f'challenge:{nonce}',
-            difficulty,
-            ex=300,
+            str(difficulty),
+            ex=self.CHALLENGE_TTL,
         )
 
     async def get_challenge(self,
                             nonce: str,
                             ) -> int | None:
-        return await self.db.get(f'challenge:{nonce}')
+        difficulty = await self.db.get(f'challenge:{nonce}')
+
+        if difficulty is None:
+            return None
+
+        return int(difficulty)
 
     async def save_route(self,
                          route: Route,
@@ -53,7 +58,7 @@ class RedisCache(Cache):
 
         await self.db.set(
             f'route:{route.node_id}',
-            json.dumps(route_data),
+            encode(route_data),
         )
 
     async def get_route(self,
@@ -62,7 +67,7 @@ class RedisCache(Cache):
         route_data = await self.db.get(f'route:{node_id}')
 
         if route_data:
-            return Route.from_dict(json.loads(route_data))
+            return Route.from_dict(decode(route_data))
 
         return None
 
@@ -0,0 +1,28 @@
+import json
+from typing import Any, Callable
+
+from dedi_gateway.etc.consts import SERVICE_CONFIG
+from dedi_gateway.etc.errors import ConfigurationParsingException
+
+
+def _load_codec() -> tuple[Callable[[Any], str | bytes], Callable[[str | bytes], Any]]:
+    """
+    Select the serialiser used for payloads stored in Redis.
+    :return: A tuple of the encode and decode callables.
+    """
+    if SERVICE_CONFIG.redis_serialiser == 'orjson':
+        import orjson
+
+        return orjson.dumps, orjson.loads
+    elif SERVICE_CONFIG.redis_serialiser == 'json':
+        return (
+            json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode,
+            json.JSONDecoder().decode,
+        )
+    else:
+        raise ConfigurationParsingException(
+            f'Unsupported Redis serialiser: {SERVICE_CONFIG.redis_serialiser}'
+        )
+
+
+encode, decode = _load_codec()
@@ -1,9 +1,9 @@
-import json
 from typing import AsyncGenerator
 import redis.asyncio as redis
 
 from dedi_gateway.etc.errors import MessageBrokerTimeoutException
 from ..message_broker import MessageBroker
+from .codec import encode, decode
 
 
 class RedisMessageBroker(MessageBroker):
@@ -11,6 +11,14 @@ class RedisMessageBroker(MessageBroker):
     A Redis-based implementation of the MessageBroker for caching and retrieving messages.
     """
     _db: redis.Redis | None = None
+    # Consumers renew their lease on every get_message, which blocks for up
+    # to DRIVER_TIMEOUT, so an expired lease means the consumer is gone
+    CONSUMER_LEASE = MessageBroker.DRIVER_TIMEOUT * 2
+
+    def __init__(self):
+        # The raw value last handed to each consumer, to acknowledge exactly it
+        self._delivered: dict[tuple[str, str], str] = {}
+        self._consumers: set[tuple[str, str]] = set()
 
     @property
     def db(self) -> redis.Redis:
@@ -32,22 +40,101 @@ class RedisMessageBroker(MessageBroker):
         """
         cls._db = client
 
-    async def get_message(self, node_id: str) -> dict | None:
+    async def _requeue(self,
+                       node_id: str,
+                       consumer_id: str,
+                       ):
+        """
+        Move the unacknowledged messages of a consumer back to the front of
+        the node queue, and forget the consumer.
+        :param node_id: The node ID the messages were retrieved for.
+        :param consumer_id: The ID of the consumer.
+        """
+        channel_name = f'message:node:{node_id}'
+        processing_name = f'{channel_name}:processing:{consumer_id}'
+
+        # Messages are taken from the left, so they are delivered next
+        while await self.db.lmove(processing_name, channel_name, 'RIGHT', 'LEFT') is not None:
+            pass
+
+        await self.db.srem(f'{channel_name}:consumers', consumer_id)
+
+    async def _recover_abandoned(self, node_id: str):
+        """
+        Requeue the messages held by consumers of a node whose lease expired,
+        such as those of a worker that died before releasing them.
+        :param node_id: The node ID to recover messages for.
+        """
+        consumers = await self.db.smembers(f'message:node:{node_id}:consumers')
+
+        for consumer_id in consumers:
+            if not await self.db.exists(f'message:node:{node_id}:lease:{consumer_id}'):
+                await self._requeue(node_id, consumer_id)
+
+    async def get_message(self,
+                          node_id: str,
+                          consumer_id: str,
+                          ) -> dict | None:
         channel_name = f'message:node:{node_id}'
+        key = (node_id, consumer_id)
+
+        if key not in self._consumers:
+            await self._recover_abandoned(node_id)
+            await self.db.sadd(f'{channel_name}:consumers', consumer_id)
+            self._consumers.add(key)
 
-        value = await self.db.blpop(
-            [channel_name],
-            timeout=self.DRIVER_TIMEOUT,
+        await self.db.set(
+            f'{channel_name}:lease:{consumer_id}',
+            1,
+            ex=self.CONSUMER_LEASE,
         )
 
-        if value:
-            return json.loads(value[1])
+        # A message handed out but not acknowledged is delivered again
+        value = self._delivered.get(key)
 
-        return None
+        if value is None:
+            value = await self.db.blmove(
+                channel_name,
+                f'{channel_name}:processing:{consumer_id}',
+                self.DRIVER_TIMEOUT,
+                'LEFT',
+                'RIGHT',
+            )
+
+            if value is None:
+                return None
+
+            self._delivered[key] = value
+
+        return decode(value)
+
+    async def acknowledge_message(self,
+                                  node_id: str,
+                                  consumer_id: str,
+                                  ):
+        value = self._delivered.pop((node_id, consumer_id), None)
+
+        if value is not None:
+            await self.db.lrem(
+                f'message:node:{node_id}:processing:{consumer_id}',
+                1,
+                value,
+            )
+
+    async def release_consumer(self,
+                               node_id: str,
+                               consumer_id: str,
+                               ):
+        key = (node_id, consumer_id)
+        self._delivered.pop(key, None)
+        self._consumers.discard(key)
+
+        await self._requeue(node_id, consumer_id)
+        await self.db.delete(f'message:node:{node_id}:lease:{consumer_id}')
 
     async def publish_message(self, node_id: str, message: dict):
         channel_name = f'message:node:{node_id}'
-        message_json = json.dumps(message)
+        message_json = encode(message)
 
         await self.db.lpush(
             channel_name,
@@ -58,7 +145,7 @@ class RedisMessageBroker(MessageBroker):
                               message: dict,
                               ):
         channel_name = f'message:response:{message["messageId"]}'
-        message_json = json.dumps(message)
+        message_json = encode(message)
 
         await self.db.lpush(
             channel_name,
@@ -71,7 +158,16 @@ class RedisMessageBroker(MessageBroker):
                                  ) -> AsyncGenerator[dict, None]:
         channel_name = f'message:response:{message_id}'
 
-        for _ in range(message_count):
+        # Take every response that has already arrived in one round trip
+        async with self.db.pipeline(transaction=True) as pipe:
+            pipe.lrange(channel_name, 0, message_count - 1)
+            pipe.ltrim(channel_name, message_count, -1)
+            queued, _ = await pipe.execute()
+
+        for value in queued:
+            yield decode(value)
+
+        for _ in range(message_count - len(queued)):
             value = await self.db.blpop(
                 [channel_name],
                 timeout=self.DRIVER_TIMEOUT,
@@ -82,4 +178,4 @@ class RedisMessageBroker(MessageBroker):
                     f"Timeout while waiting for response for message ID: {message_id}"
                 )
 
-            yield json.loads(value[1])
+            yield decode(value[1])
@@ -1,3 +1,5 @@
+import functools
+
 from dedi_gateway.etc.consts import SERVICE_CONFIG
 from dedi_gateway.etc.errors import ConfigurationParsingException
 from dedi_gateway.model.network import NetworkRepository
@@ -7,6 +9,8 @@ from dedi_gateway.model.user import UserRepository
 
 
 class Database:
+    __slots__ = ()
+
     @property
     def networks(self) -> NetworkRepository:
         """
@@ -55,20 +59,28 @@ class Database:
         """
         raise NotImplementedError
 
+    async def ensure_indexes(self):
+        """
+        Create the indexes the repositories rely on, if the backend supports
+        them. Called once at startup; drivers without indexes do nothing.
+        """
+        return None
 
-_active_db: Database | None = None
+    async def warm_up(self):
+        """
+        Read frequently used data so the backend keeps it in memory. Run
+        periodically; drivers that already hold everything in memory do nothing.
+        """
+        return None
 
 
-def get_active_db() -> Database | None:
+@functools.cache
+def get_active_db() -> Database:
     """
-    Return the active database set by configuration
+    Return the active database set by configuration. The instance is created
+    on the first call and reused afterwards.
     :return: Database instance based on the configuration.
     """
-    global _active_db
-
-    if _active_db is not None:
-        return _active_db
-
     if SERVICE_CONFIG.database_driver == 'mongo':
         from pymongo import AsyncMongoClient
         from .mongo_driver import MongoDatabase
@@ -76,21 +88,19 @@ def get_active_db() -> Database | None:
         mongo_client = AsyncMongoClient(
             host=SERVICE_CONFIG.mongodb_host,
             port=SERVICE_CONFIG.mongodb_port,
+            maxPoolSize=SERVICE_CONFIG.mongodb_pool_size,
+            compressors=SERVICE_CONFIG.mongodb_compressors or [],
         )
         MongoDatabase.set_client(
             client=mongo_client,
             db_name=SERVICE_CONFIG.mongodb_db_name,
         )
 
-        _active_db = MongoDatabase()
-
-        return _active_db
+        return MongoDatabase()
     elif SERVICE_CONFIG.database_driver == 'memory':
         from .memory import MemoryDatabase
 
-        _active_db = MemoryDatabase()
-
-        return _active_db
+        return MemoryDatabase()
     else:
         raise ConfigurationParsingException(
             f'Unsupported database driver: {SERVICE_CONFIG.database_driver}'
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from ..database import Database
 from .network import MemoryNetworkRepository
 from .network_message import MemoryNetworkMessageRepository
@@ -11,35 +13,57 @@ class MemoryDatabase(Database):
     This is intended for development and demonstration purposes only.
     Do not use in production.
     """
-    _networks = {}
-    _messages = {}
-    _nodes = {}
-    _users = {}
-    _data_index = {}
+    __slots__ = (
+        '_networks',
+        '_messages',
+        '_nodes',
+        '_users',
+        '_data_index',
+        '_networks_repo',
+        '_messages_repo',
+        '_nodes_repo',
+        '_users_repo',
+    )
 
-    @property
-    def networks(self) -> MemoryNetworkRepository:
-        return MemoryNetworkRepository(
+    def __init__(self):
+        """
+        Initialise the MemoryDatabase with its own empty stores. The
+        repositories wrap these stores, so they are created once and reused.
+        """
+        self._networks = {}
+        self._messages = {'sentRequests': OrderedDict(), 'receivedRequests': OrderedDict()}
+        self._nodes = {}
+        self._users = {}
+        self._data_index = {}
+
+        self._nodes_repo = MemoryNodeRepository(self._nodes)
+        self._networks_repo = MemoryNetworkRepository(
             db=self._networks,
-            node_repository=self.nodes,
+            node_repository=self._nodes_repo,
         )
+        self._messages_repo = MemoryNetworkMessageRepository(self._messages)
+        self._users_repo = MemoryUserRepository(self._users)
+
+    @property
+    def networks(self) -> MemoryNetworkRepository:
+        return self._networks_repo
 
     @property
     def messages(self) -> MemoryNetworkMessageRepository:
-        return MemoryNetworkMessageRepository(self._messages)
+        return self._messages_repo
 
     @property
     def nodes(self) -> MemoryNodeRepository:
-        return MemoryNodeRepository(self._nodes)
+        return self._nodes_repo
 
     @property
     def users(self) -> MemoryUserRepository:
-        return MemoryUserRepository(self._users)
+        return self._users_repo
 
     async def save_data_index(self,
                               data_index: dict,
                               ):
-        MemoryDatabase._data_index = data_index
+        self._data_index = data_index
 
     async def get_data_index(self) -> dict:
         return self._data_index
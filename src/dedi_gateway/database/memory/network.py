@@ -1,3 +1,5 @@
+from collections import defaultdict
+from typing import AsyncIterator
 from dedi_link.model import Node
 
 from dedi_gateway.etc.errors import NetworkNotFoundException
@@ -9,6 +11,8 @@ class MemoryNetworkRepository(NetworkRepository):
     """
     In-memory implementation of the NetworkRepository interface.
     """
+    __slots__ = ('db', '_by_visible', '_by_registered')
+
     def __init__(self, db, node_repository: MemoryNodeRepository):
         """
         Initialise the MemoryNetworkRepository with a NodeRepository instance.
@@ -17,53 +21,123 @@ class MemoryNetworkRepository(NetworkRepository):
         super().__init__(node_repository)
         self.db = db
 
-    async def get(self, network_id: str) -> Network:
-        network_data = self.db.get(network_id)
+        # Secondary indexes of network IDs, kept in step with every write. The
+        # buckets are dicts, so filtered results keep the order networks were added
+        self._by_visible: defaultdict[bool, dict[str, None]] = defaultdict(dict)
+        self._by_registered: defaultdict[bool, dict[str, None]] = defaultdict(dict)
+
+        for network in db.values():
+            self._index(network)
 
-        if not network_data:
+    @staticmethod
+    def _place(index: defaultdict[bool, dict[str, None]],
+               value: bool,
+               network_id: str,
+               ):
+        """
+        Move a network ID into the bucket for its value, keeping its place if
+        it is already there. Every bucket is checked, because the stored
+        network may have been changed in place.
+        :param index: The secondary index to update.
+        :param value: The network's value of the indexed field.
+        :param network_id: The ID of the network.
+        """
+        for bucket_value, network_ids in index.items():
+            if bucket_value != value:
+                network_ids.pop(network_id, None)
+
+        index[value].setdefault(network_id)
+
+    def _index(self, network: Network):
+        """
+        Add or move a network in the secondary indexes.
+        :param network: The stored network.
+        """
+        self._place(self._by_visible, network.visible, network.network_id)
+        self._place(self._by_registered, network.registered, network.network_id)
+
+    def _unindex(self, network_id: str):
+        """
+        Remove a network from the secondary indexes. Every bucket is checked,
+        because the stored network may have been changed in place.
+        :param network_id: The ID of the network.
+        """
+        for network_ids in self._by_visible.values():
+            network_ids.pop(network_id, None)
+        for network_ids in self._by_registered.values():
+            network_ids.pop(network_id, None)
+
+    async def get(self,
+                  network_id: str,
+                  *,
+                  cached: bool = True,
+                  ) -> Network:
+        network = self.db.get(network_id)
+
+        if not network:
             raise NetworkNotFoundException(
                 f'Network with ID {network_id} not found.'
             )
 
-        return Network.from_dict(network_data)
+        return network
 
     async def filter(self,
                      *,
                      visible: bool | None = None,
                      registered: bool | None = None,
                      ) -> list[Network]:
-        networks = list(self.db.values())
+        if visible is None and registered is None:
+            return list(self.db.values())
+
+        if visible is not None and registered is not None:
+            registered_ids = self._by_registered[registered]
+            network_ids = [i for i in self._by_visible[visible] if i in registered_ids]
+        elif visible is not None:
+            network_ids = self._by_visible[visible]
+        else:
+            network_ids = self._by_registered[registered]
 
-        if visible is not None:
-            networks = [n for n in networks if n['visible'] == visible]
-        if registered is not None:
-            networks = [n for n in networks if n['registered'] == registered]
+        return [self.db[network_id] for network_id in network_ids]
 
-        return [Network.from_dict(n) for n in networks]
+    async def iter(self) -> AsyncIterator[Network]:
+        # Snapshot the values, networks may be added while the caller awaits
+        for network in list(self.db.values()):
+            yield network
 
     async def save(self, network: Network) -> None:
         if network.network_id in self.db:
             raise ValueError(f'Network with ID {network.network_id} already exists.')
 
-        self.db[network.network_id] = network.to_dict()
+        self.db[network.network_id] = network
+        self._index(network)
+
+    async def save_many(self, networks: list[Network]) -> None:
+        for network in networks:
+            await self.save(network)
 
     async def delete(self, network_id: str) -> None:
-        if network_id not in self.db:
-            raise ValueError(f'Network with ID {network_id} does not exist.')
+        try:
+            del self.db[network_id]
+        except KeyError as e:
+            raise ValueError(f'Network with ID {network_id} does not exist.') from e
 
-        del self.db[network_id]
+        self._unindex(network_id)
 
     async def update(self, network: Network) -> None:
         if network.network_id not in self.db:
             raise ValueError(f'Network with ID {network.network_id} does not exist.')
 
-        self.db[network.network_id] = network.to_dict()
+        self.db[network.network_id] = network
+        self._index(network)
 
     async def add_node(self, network_id: str, node: Node) -> None:
         await self.node_repository.save(node)
 
-        if network_id not in self.db:
-            raise ValueError(f'Network with ID {network_id} does not exist.')
+        try:
+            network = self.db[network_id]
+        except KeyError as e:
+            raise ValueError(f'Network with ID {network_id} does not exist.') from e
 
-        network_dict = self.db[network_id]
-        network_dict['nodeIds'].append(node.node_id)
+        # Same semantics as $addToSet in the MongoDB driver
+        if node.node_id not in network.node_ids:
+            network.node_ids.append(node.node_id)
@@ -1,15 +1,25 @@
+import itertools
+import time
+from collections import OrderedDict
 from typing import Mapping, Any
 from dedi_link.etc.enums import AuthMessageStatus
 from dedi_link.model import AuthRequest, AuthInvite
 
 from dedi_gateway.etc.errors import NetworkMessageNotFoundException
-from dedi_gateway.model.network_message import NetworkMessageRepository
+from dedi_gateway.model.network_message import NetworkMessageRepository, STATUS_VALUES
+
+_PENDING = STATUS_VALUES[AuthMessageStatus.PENDING]
 
 
 class MemoryNetworkMessageRepository(NetworkMessageRepository):
     """
     In-memory implementation of the NetworkMessageRepository interface.
     """
+    __slots__ = ('db', '_saved_at')
+
+    MAX_STORED_REQUESTS = 10000
+    REQUEST_TTL = 7 * 24 * 60 * 60
+
     def __init__(self, db: dict):
         """
         Initialise the NetworkMessageRepository with a dictionary.
@@ -17,6 +27,46 @@ class MemoryNetworkMessageRepository(NetworkMessageRepository):
         """
         self.db = db
 
+        self.db.setdefault('sentRequests', OrderedDict())
+        self.db.setdefault('receivedRequests', OrderedDict())
+
+        # When each stored request was last saved, by store and message ID
+        self._saved_at: dict[str, dict[str, float]] = {
+            'sentRequests': {},
+            'receivedRequests': {},
+        }
+
+    def _store_payload(self,
+                       store_name: str,
+                       message_id: str,
+                       payload: dict,
+                       ):
+        """
+        Store a request payload as the most recently used entry, then evict
+        the oldest entries while the store is over its size limit or they
+        have outlived REQUEST_TTL.
+        :param store_name: The name of the store, sentRequests or receivedRequests.
+        :param message_id: The message ID of the request.
+        :param payload: The payload to store.
+        """
+        store: OrderedDict[str, dict] = self.db[store_name]
+        saved_at = self._saved_at[store_name]
+        now = time.monotonic()
+
+        store[message_id] = payload
+        store.move_to_end(message_id)
+        saved_at[message_id] = now
+
+        while store:
+            oldest_id = next(iter(store))
+
+            if len(store) <= self.MAX_STORED_REQUESTS \
+                    and saved_at.get(oldest_id, now) + self.REQUEST_TTL > now:
+                break
+
+            store.pop(oldest_id)
+            saved_at.pop(oldest_id, None)
+
     async def save_sent_request(self,
                                 target_url: str,
                                 request: AuthRequest | AuthInvite,
@@ -26,51 +76,38 @@ class MemoryNetworkMessageRepository(NetworkMessageRepository):
             'targetUrl': target_url,
             'request': request.to_dict(),
             'requiresPolling': requires_polling,
-            'status': AuthMessageStatus.PENDING.value,
+            'status': _PENDING,
         }
 
-        if 'sentRequests' not in self.db:
-            self.db['sentRequests'] = {}
-
-        self.db['sentRequests'][request.metadata.message_id] = payload
+        self._store_payload('sentRequests', request.metadata.message_id, payload)
 
     async def save_received_request(self,
                                     request: AuthRequest | AuthInvite,
                                     ):
         payload = {
             'request': request.to_dict(),
-            'status': AuthMessageStatus.PENDING.value,
+            'status': _PENDING,
         }
 
-        if 'receivedRequests' not in self.db:
-            self.db['receivedRequests'] = {}
-
-        self.db['receivedRequests'][request.metadata.message_id] = payload
+        self._store_payload('receivedRequests', request.metadata.message_id, payload)
 
     async def get_requests(self,
                            sent: bool = None,
                            status: list[AuthMessageStatus] = None,
                            ) -> list[dict]:
-        docs = []
-
-        if sent is not True:
-            received_requests = self.db.get('receivedRequests', {})
-            for request in received_requests.values():
-                if status is None or request['status'] in [s.value for s in status]:
-                    docs.append(request)
-
-        if sent is not False:
-            sent_requests = self.db.get('sentRequests', {})
-            for request in sent_requests.values():
-                if status is None or request['status'] in [s.value for s in status]:
-                    docs.append(request)
+        status_values = frozenset(STATUS_VALUES[s] for s in status) if status is not None else None
+        received_requests = self.db['receivedRequests'].values() if sent is not True else ()
+        sent_requests = self.db['sentRequests'].values() if sent is not False else ()
 
-        return docs
+        return [
+            request for request in itertools.chain(received_requests, sent_requests)
+            if status_values is None or request['status'] in status_values
+        ]
 
     async def get_received_request(self,
                                    request_id: str,
                                    ) -> Mapping[str, Any]:
-        received_requests = self.db.get('receivedRequests', {})
+        received_requests = self.db['receivedRequests']
         target_request = received_requests.get(request_id)
 
         if not target_request:
@@ -83,7 +120,7 @@ class MemoryNetworkMessageRepository(NetworkMessageRepository):
     async def get_sent_request(self,
                                request_id: str,
                                ) -> Mapping[str, Any]:
-        sent_requests = self.db.get('sentRequests', {})
+        sent_requests = self.db['sentRequests']
         target_request = sent_requests.get(request_id)
 
         if not target_request:
@@ -97,13 +134,13 @@ class MemoryNetworkMessageRepository(NetworkMessageRepository):
                                     request_id: str,
                                     status: AuthMessageStatus,
                                     ) -> None:
-        received_requests = self.db.get('receivedRequests', {})
-        sent_requests = self.db.get('sentRequests', {})
+        received_requests = self.db['receivedRequests']
+        sent_requests = self.db['sentRequests']
 
         if request_id in received_requests:
-            received_requests[request_id]['status'] = status.value
+            received_requests[request_id]['status'] = STATUS_VALUES[status]
         elif request_id in sent_requests:
-            sent_requests[request_id]['status'] = status.value
+            sent_requests[request_id]['status'] = STATUS_VALUES[status]
         else:
             raise NetworkMessageNotFoundException(
                 f'Request with ID {request_id} not found.'
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from dedi_link.model import Node
 
 from dedi_gateway.model.node import NodeRepository
@@ -7,6 +8,7 @@ class MemoryNodeRepository(NodeRepository):
     """
     In-memory implementation of the UserRepository interface.
     """
+    __slots__ = ('db', '_by_approved')
 
     def __init__(self,
                  db: dict,
@@ -17,46 +19,82 @@ class MemoryNodeRepository(NodeRepository):
         """
         self.db = db
 
-    async def get(self, node_id: str) -> Node | None:
-        node = self.db.get(node_id)
+        # Secondary index of node IDs by approval, kept in step with every write.
+        # The buckets are dicts, so filtered results keep the order nodes were added
+        self._by_approved: defaultdict[bool, dict[str, None]] = defaultdict(dict)
 
-        return Node.from_dict(node) if node else None
+        for node in db.values():
+            self._index(node)
 
-    async def batch_get(self, node_ids: list[str]) -> list[Node]:
-        nodes = []
+    def _index(self, node: Node):
+        """
+        Move a node into the approval bucket for its status, keeping its place
+        if it is already there. Both buckets are checked, because the stored
+        node may have been changed in place.
+        :param node: The stored node.
+        """
+        for approved, node_ids in self._by_approved.items():
+            if approved != node.approved:
+                node_ids.pop(node.node_id, None)
+
+        self._by_approved[node.approved].setdefault(node.node_id)
+
+    def _unindex(self, node_id: str):
+        """
+        Remove a node from the approval index. Both buckets are checked,
+        because the stored node may have been changed in place.
+        :param node_id: The ID of the node.
+        """
+        for node_ids in self._by_approved.values():
+            node_ids.pop(node_id, None)
+
+    async def get(self,
+                  node_id: str,
+                  *,
+                  cached: bool = True,
+                  ) -> Node | None:
+        return self.db.get(node_id)
 
-        for node_id in node_ids:
-            node = await self.get(node_id)
-            if node:
-                nodes.append(node)
+    async def batch_get(self, node_ids: list[str]) -> list[Node]:
+        db = self.db
 
-        return nodes
+        return [node for node in map(db.get, node_ids) if node]
 
     async def filter(self,
                      *,
                      approved: bool | None = None,
                      ) -> list[Node]:
-        nodes = list(self.db.values())
+        if approved is None:
+            return list(self.db.values())
 
-        if approved is not None:
-            nodes = [n for n in nodes if n['approved'] == approved]
-
-        return [Node.from_dict(n) for n in nodes]
+        return [self.db[node_id] for node_id in self._by_approved[approved]]
 
     async def save(self, node: Node) -> None:
-        if self.db.get(node.node_id):
+        if node.node_id in self.db:
             raise ValueError(f'Node with ID {node.node_id} already exists.')
 
-        self.db[node.node_id] = node.to_dict()
+        self.db[node.node_id] = node
+        self._index(node)
+
+    async def save_many(self, nodes: list[Node]) -> None:
+        for node in nodes:
+            await self.save(node)
 
     async def delete(self, node_id: str) -> None:
-        if node_id not in self.db:
-            raise ValueError(f'Node with ID {node_id} does not exist.')
+        try:
+            del self.db[node_id]
+        except KeyError as e:
+            raise ValueError(f'Node with ID {node_id} does not exist.') from e
 
-        self.db.pop(node_id)
+        self._unindex(node_id)
 
     async def update(self, node: Node) -> None:
-        if not self.db.get(node.node_id):
+        if node.node_id not in self.db:
             raise ValueError(f'Node with ID {node.node_id} does not exist.')
 
-        self.db[node.node_id] = node.to_dict()
+        self.db[node.node_id] = node
+        self._index(node)
+
+    async def update_many(self, nodes: list[Node]) -> None:
+        for node in nodes:
+            await self.update(node)
@@ -7,6 +7,8 @@ class MemoryUserRepository(UserRepository):
     """
     In-memory implementation of the UserRepository interface.
     """
+    __slots__ = ('db',)
+
     def __init__(self, db: dict):
         """
         Initialise the MemoryUserRepository with a dictionary.
@@ -15,24 +17,22 @@ class MemoryUserRepository(UserRepository):
         self.db = db
 
     async def get(self, user_id: str) -> User | None:
-        user = self.db.get(user_id)
-
-        return User.from_dict(user) if user else None
+        return self.db.get(user_id)
 
     async def save(self, user: User) -> None:
-        if self.db.get(user.user_id):
+        if user.user_id in self.db:
             raise ValueError(f'User with ID {user.user_id} already exists.')
 
-        self.db[user.user_id] = user.to_dict()
+        self.db[user.user_id] = user
 
     async def delete(self, user_id: str) -> None:
-        if user_id not in self.db:
-            raise ValueError(f'User with ID {user_id} does not exist.')
-
-        self.db.pop(user_id)
+        try:
+            del self.db[user_id]
+        except KeyError as e:
+            raise ValueError(f'User with ID {user_id} does not exist.') from e
 
     async def update(self, user: User) -> None:
-        if not self.db.get(user.user_id):
+        if user.user_id not in self.db:
             raise ValueError(f'User with ID {user.user_id} does not exist.')
 
-        self.db[user.user_id] = user.to_dict()
+        self.db[user.user_id] = user
@@ -0,0 +1,109 @@
+import asyncio
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import BulkWriteError, WriteError
+
+
+class AsyncBatchWriter:
+    """
+    Coalesce single document inserts into a collection into batched
+    insert_many calls, flushed when enough documents are pending or
+    shortly after the first one was queued.
+    """
+    def __init__(self,
+                 collection: AsyncCollection,
+                 batch_size: int = 200,
+                 flush_interval: float = 0.005,
+                 ):
+        """
+        Initialise the AsyncBatchWriter.
+        :param collection: The collection to insert documents into.
+        :param batch_size: Number of pending documents that triggers a flush.
+        :param flush_interval: Seconds to wait for more documents before flushing.
+        """
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._writes: set[asyncio.Task] = set()
+
+    def insert(self, document: dict) -> asyncio.Future:
+        """
+        Queue a document for insertion.
+        :param document: The document to insert.
+        :return: A future resolved once the batch containing the document
+            has been written, or failed with the error for this document.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((document, future))
+
+        if len(self._pending) >= self.batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._start_flush)
+
+        return future
+
+    async def flush(self):
+        """
+        Write all pending documents and wait for every in-flight batch.
+        """
+        self._start_flush()
+
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def _start_flush(self):
+        """
+        Hand the pending documents to a background write.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+
+        task = asyncio.create_task(self._write(batch))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write(self, batch: list[tuple[dict, asyncio.Future]]):
+        """
+        Insert a batch of documents and resolve their futures.
+        :param batch: The documents and their futures.
+        """
+        # Stays None if the write is cancelled before it completes
+        failed = None
+
+        try:
+            await self.collection.insert_many(
+                [document for document, _ in batch],
+                ordered=False,
+            )
+        except BulkWriteError as e:
+            # Unordered inserts still write every document that did not fail
+            failed = {
+                error['index']: WriteError(error.get('errmsg'), error.get('code'), error)
+                for error in e.details.get('writeErrors', [])
+            }
+        except Exception as e:
+            failed = {index: e for index in range(len(batch))}
+        else:
+            failed = {}
+        finally:
+            for index, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+
+                if failed is None:
+                    # Cancel the callers rather than leave them waiting forever
+                    future.cancel()
+                elif index in failed:
+                    future.set_exception(failed[index])
+                else:
+                    future.set_result(None)
@@ -0,0 +1,52 @@
+import asyncio
+from typing import AsyncGenerator, Callable, TypeVar
+from pymongo.asynchronous.cursor import AsyncCursor
+
+T = TypeVar('T')
+
+PREFETCH_BATCH_SIZE = 256
+OFFLOAD_THRESHOLD = 256
+
+
+async def prefetch(cursor: AsyncCursor,
+                   batch_size: int = PREFETCH_BATCH_SIZE,
+                   ) -> AsyncGenerator[dict, None]:
+    """
+    Iterate over a cursor one batch ahead, so the next batch is fetched
+    from the server while the current one is being consumed.
+    :param cursor: The cursor to iterate over.
+    :param batch_size: Number of documents fetched per round trip.
+    :return: An asynchronous generator yielding the cursor's documents.
+    """
+    cursor.batch_size(batch_size)
+    batch = await cursor.to_list(length=batch_size)
+    pending = None
+
+    try:
+        while batch:
+            pending = asyncio.create_task(cursor.to_list(length=batch_size))
+
+            for document in batch:
+                yield document
+
+            batch = await pending
+            pending = None
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def load_all(documents: list[dict],
+                   from_dict: Callable[[dict], T],
+                   ) -> list[T]:
+    """
+    Build models from a list of documents, in a worker thread when the list
+    is large enough to hold up the event loop.
+    :param documents: The documents read from the database.
+    :param from_dict: The factory building a model from one document.
+    :return: A list of models, in the order of the documents.
+    """
+    if len(documents) > OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(lambda: [from_dict(d) for d in documents])
+
+    return [from_dict(d) for d in documents]
@@ -1,4 +1,6 @@
+import asyncio
 from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
 
 from ..database import Database
 from .network import MongoNetworkRepository
@@ -13,35 +15,78 @@ class MongoDatabase(Database):
     """
     _client: AsyncMongoClient = None
     _db_name = 'dedi-gateway'
+    _db_handle: AsyncDatabase | None = None
+
+    def __init__(self):
+        """
+        Initialise the MongoDatabase. Repositories are created on first access
+        and reused until set_client binds a different database.
+        """
+        self._repositories: dict[str, object] = {}
+        self._repositories_db: AsyncDatabase | None = None
+
+    def _get_repositories(self) -> dict[str, object]:
+        """
+        Get the repository cache, emptying it if set_client has bound a
+        different database since it was filled.
+        :return: The repository cache, keyed by repository name.
+        """
+        if self._repositories_db is not self._db_handle:
+            self._repositories = {}
+            self._repositories_db = self._db_handle
+
+        return self._repositories
 
     @property
-    def db(self):
+    def db(self) -> AsyncDatabase:
         """
         Get the MongoDB database instance.
         :return: The MongoDB database instance.
         """
-        if self._client is None:
+        db = self._db_handle
+
+        if db is None:
             raise ValueError('MongoDB client is not set. Call set_client() first.')
-        return self._client[self._db_name]
+        return db
 
     @property
     def networks(self) -> MongoNetworkRepository:
-        return MongoNetworkRepository(
-            db=self.db,
-            node_repository=self.nodes,
-        )
+        repositories = self._get_repositories()
+
+        if 'networks' not in repositories:
+            repositories['networks'] = MongoNetworkRepository(
+                db=self.db,
+                node_repository=self.nodes,
+            )
+
+        return repositories['networks']
 
     @property
     def messages(self) -> MongoNetworkMessageRepository:
-        return MongoNetworkMessageRepository(self.db)
+        repositories = self._get_repositories()
+
+        if 'messages' not in repositories:
+            repositories['messages'] = MongoNetworkMessageRepository(self.db)
+
+        return repositories['messages']
 
     @property
     def nodes(self) -> MongoNodeRepository:
-        return MongoNodeRepository(self.db)
+        repositories = self._get_repositories()
+
+        if 'nodes' not in repositories:
+            repositories['nodes'] = MongoNodeRepository(self.db)
+
+        return repositories['nodes']
 
     @property
     def users(self) -> MongoUserRepository:
-        return MongoUserRepository(self.db)
+        repositories = self._get_repositories()
+
+        if 'users' not in repositories:
+            repositories['users'] = MongoUserRepository(self.db)
+
+        return repositories['users']
 
     @classmethod
     def set_client(cls,
@@ -55,6 +100,21 @@ class MongoDatabase(Database):
         """
         cls._client = client
         cls._db_name = db_name
+        cls._db_handle = client[db_name]
+
+    async def ensure_indexes(self):
+        await asyncio.gather(
+            self.nodes.ensure_indexes(),
+            self.networks.ensure_indexes(),
+            self.users.ensure_indexes(),
+            self.messages.ensure_indexes(),
+        )
+
+    async def warm_up(self):
+        await asyncio.gather(
+            self.nodes.warm_up(),
+            self.networks.warm_up(),
+        )
 
     async def save_data_index(self,
                               data_index: dict,
@@ -69,12 +129,9 @@ class MongoDatabase(Database):
 
     async def get_data_index(self) -> dict:
         collection = self.db['data_index']
-        data_index = await collection.find_one({'_id': 'data_index'})
+        data_index = await collection.find_one({'_id': 'data_index'}, {'_id': 0})
 
         if data_index is None:
             return {}
 
-        # Remove the '_id' field before returning
-        data_index = {k: v for k, v in data_index.items() if k != '_id'}
-
         return data_index
@@ -0,0 +1,25 @@
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import OperationFailure
+
+from dedi_gateway.etc.consts import LOGGER
+
+
+async def ensure_unique_index(collection: AsyncCollection,
+                              key: str,
+                              ):
+    """
+    Create a unique index on a field, falling back to a plain index if
+    documents already stored in the collection share a value.
+    :param collection: The collection to index.
+    :param key: The field to index.
+    """
+    try:
+        await collection.create_index(key, unique=True)
+    except OperationFailure as e:
+        LOGGER.warning(
+            'Could not create unique %s index on %s: %s',
+            key,
+            collection.name,
+            e
+        )
+        await collection.create_index(key)
@@ -1,15 +1,25 @@
+from typing import AsyncIterator
+from pymongo import UpdateOne
 from pymongo.asynchronous.database import AsyncDatabase
 from dedi_link.model import Node, Network
 
 from dedi_gateway.etc.errors import NetworkNotFoundException
 from dedi_gateway.model.network import NetworkRepository
 from .node import MongoNodeRepository
+from .cursor import load_all, prefetch
+from .indexes import ensure_unique_index
+from .repository_cache import RepositoryCache
 
 
 class MongoNetworkRepository(NetworkRepository):
     """
     MongoDB implementation of the NetworkRepository interface.
     """
+    # Network.from_dict ignores the ObjectId, so do not fetch or decode it
+    _PROJECTION = {'_id': 0}
+    CACHE_SIZE = 4096
+    CACHE_TTL = 30
+
     def __init__(self,
                  db: AsyncDatabase,
                  node_repository: MongoNodeRepository
@@ -23,9 +33,38 @@ class MongoNetworkRepository(NetworkRepository):
 
         self.db = db
         self.collection = db['networks']
+        self._cache = RepositoryCache(max_size=self.CACHE_SIZE, ttl=self.CACHE_TTL)
+
+    async def ensure_indexes(self):
+        """
+        Create the indexes used to look up networks by ID and flags.
+        """
+        await ensure_unique_index(self.collection, 'networkId')
+        await self.collection.create_index('visible')
+        await self.collection.create_index('registered')
+
+    async def warm_up(self):
+        """
+        Read every network once, so the server keeps the collection in memory.
+        """
+        async for _ in prefetch(self.collection.find({}, self._PROJECTION)):
+            pass
+
+    async def get(self,
+                  network_id: str,
+                  *,
+                  cached: bool = True,
+                  ) -> Network:
+        network_data = self._cache.get(network_id) if cached else None
 
-    async def get(self, network_id: str) -> Network:
-        network_data = await self.collection.find_one({'networkId': network_id})
+        if network_data is None:
+            network_data = await self.collection.find_one(
+                {'networkId': network_id},
+                self._PROJECTION,
+            )
+
+            if network_data:
+                self._cache.put(network_id, network_data)
 
         if network_data:
             return Network.from_dict(network_data)
@@ -46,30 +85,62 @@ class MongoNetworkRepository(NetworkRepository):
         if registered is not None:
             filters['registered'] = registered
 
-        cursor = self.collection.find(filters)
+        networks_data = await self.collection.find(filters, self._PROJECTION).to_list(length=None)
 
-        networks = []
-        async for network_data in cursor:
-            networks.append(Network.from_dict(network_data))
+        return await load_all(networks_data, Network.from_dict)
 
-        return networks
+    async def iter(self) -> AsyncIterator[Network]:
+        async for network_data in prefetch(self.collection.find({}, self._PROJECTION)):
+            yield Network.from_dict(network_data)
 
     async def save(self, network: Network) -> None:
+        network_data = network.to_dict()
+
         await self.collection.update_one(
             {'networkId': network.network_id},
-            {'$set': network.to_dict()},
+            {'$set': network_data},
             upsert=True
         )
+        self._cache.put(network.network_id, network_data)
+
+    async def save_many(self, networks: list[Network]) -> None:
+        if not networks:
+            return
+
+        networks_data = {network.network_id: network.to_dict() for network in networks}
+
+        await self.collection.bulk_write(
+            [
+                UpdateOne(
+                    {'networkId': network_id},
+                    {'$set': network_data},
+                    upsert=True
+                )
+                for network_id, network_data in networks_data.items()
+            ],
+            ordered=False,
+        )
+
+        for network_id, network_data in networks_data.items():
+            self._cache.put(network_id, network_data)
 
     async def delete(self, network_id: str) -> None:
         await self.collection.delete_one({'networkId': network_id})
+        self._cache.invalidate(network_id)
 
     async def update(self, network: Network) -> None:
-        await self.collection.update_one(
+        network_data = network.to_dict()
+
+        result = await self.collection.update_one(
             {'networkId': network.network_id},
-            {'$set': network.to_dict()}
+            {'$set': network_data}
         )
 
+        if result.matched_count:
+            self._cache.put(network.network_id, network_data)
+        else:
+            self._cache.invalidate(network.network_id)
+
     async def add_node(self, network_id: str, node: Node) -> None:
         await self.node_repository.save(node)
 
@@ -77,3 +148,4 @@ class MongoNetworkRepository(NetworkRepository):
             {'networkId': network_id},
             {'$addToSet': {'nodeIds': node.node_id}}
         )
+        self._cache.invalidate(network_id)
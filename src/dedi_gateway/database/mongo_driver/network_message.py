@@ -1,16 +1,23 @@
+import asyncio
 from typing import Mapping, Any
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.asynchronous.database import AsyncDatabase
 from dedi_link.etc.enums import AuthMessageStatus
 from dedi_link.model import AuthRequest, AuthInvite
 
 from dedi_gateway.etc.errors import NetworkMessageNotFoundException
-from dedi_gateway.model.network_message import NetworkMessageRepository
+from dedi_gateway.model.network_message import NetworkMessageRepository, STATUS_VALUES
+from .batch_writer import AsyncBatchWriter
+from .cursor import prefetch
+from .indexes import ensure_unique_index
 
 
 class MongoNetworkMessageRepository(NetworkMessageRepository):
     """
     MongoDB implementation of the NetworkMessageRepository interface.
     """
+    # Request payloads are returned as is, the ObjectId is never used
+    _PROJECTION = {'_id': 0}
 
     def __init__(self, db: AsyncDatabase):
         """
@@ -20,6 +27,8 @@ class MongoNetworkMessageRepository(NetworkMessageRepository):
         self.db = db
         self.sent_requests = db['messages.requests.sent']
         self.received_requests = db['messages.requests.received']
+        self._sent_writer = AsyncBatchWriter(self.sent_requests)
+        self._received_writer = AsyncBatchWriter(self.received_requests)
 
     async def save_sent_request(self,
                                 target_url: str,
@@ -30,49 +39,72 @@ class MongoNetworkMessageRepository(NetworkMessageRepository):
             'targetUrl': target_url,
             'request': request.to_dict(),
             'requiresPolling': requires_polling,
-            'status': AuthMessageStatus.PENDING.value,
+            'status': STATUS_VALUES[AuthMessageStatus.PENDING],
         }
 
-        await self.sent_requests.insert_one(payload)
+        await self._sent_writer.insert(payload)
 
     async def save_received_request(self,
                                     request: AuthRequest | AuthInvite,
                                     ):
         payload = {
             'request': request.to_dict(),
-            'status': AuthMessageStatus.PENDING.value,
+            'status': STATUS_VALUES[AuthMessageStatus.PENDING],
         }
 
-        await self.received_requests.insert_one(payload)
+        await self._received_writer.insert(payload)
+
+    async def ensure_indexes(self):
+        """
+        Create the indexes used to look up requests by message ID and status.
+        """
+        for collection in (self.sent_requests, self.received_requests):
+            await ensure_unique_index(collection, 'request.metadata.messageId')
+            await collection.create_index('status')
+
+    @staticmethod
+    async def _find_requests(collection: AsyncCollection,
+                             query: dict,
+                             ) -> list[dict]:
+        """
+        Fetch all requests matching a query from one collection.
+        :param collection: The request collection to query.
+        :param query: The query to filter requests by.
+        :return: A list of matching request documents.
+        """
+        cursor = collection.find(query, MongoNetworkMessageRepository._PROJECTION)
+
+        return [doc async for doc in prefetch(cursor)]
 
     async def get_requests(self,
                            sent: bool = None,
                            status: list[AuthMessageStatus] = None,
                            ) -> list[dict]:
         query = {}
-        docs = []
+        collections = []
 
         if status:
-            query['status'] = {'$in': [s.value for s in status]}
+            query['status'] = {'$in': [STATUS_VALUES[s] for s in status]}
 
         if sent is not True:
-            cursor = self.received_requests.find(query)
-
-            async for doc in cursor:
-                docs.append(doc)
-
+            collections.append(self.received_requests)
         if sent is not False:
-            cursor = self.sent_requests.find(query)
+            collections.append(self.sent_requests)
 
-            async for doc in cursor:
-                docs.append(doc)
+        # Query both collections concurrently, received requests stay first
+        results = await asyncio.gather(*(
+            self._find_requests(collection, query) for collection in collections
+        ))
 
-        return docs
+        return [doc for docs in results for doc in docs]
 
     async def get_received_request(self,
                                    request_id: str,
                                    ) -> Mapping[str, Any]:
-        payload = await self.received_requests.find_one({'request.metadata.messageId': request_id})
+        payload = await self.received_requests.find_one(
+            {'request.metadata.messageId': request_id},
+            self._PROJECTION,
+        )
 
         if not payload:
             raise NetworkMessageNotFoundException(
@@ -84,7 +116,10 @@ class MongoNetworkMessageRepository(NetworkMessageRepository):
     async def get_sent_request(self,
                                request_id: str,
                                ) -> Mapping[str, Any]:
-        payload = await self.sent_requests.find_one({'request.metadata.messageId': request_id})
+        payload = await self.sent_requests.find_one(
+            {'request.metadata.messageId': request_id},
+            self._PROJECTION,
+        )
 
         if not payload:
             raise NetworkMessageNotFoundException(
@@ -97,18 +132,16 @@ class MongoNetworkMessageRepository(NetworkMessageRepository):
                                     request_id: str,
                                     status: AuthMessageStatus,
                                     ) -> None:
-        result = await self.received_requests.update_one(
-            {'request.metadata.messageId': request_id},
-            {'$set': {'status': status.value}}
-        )
+        query = {'request.metadata.messageId': request_id}
+        update = {'$set': {'status': STATUS_VALUES[status]}}
 
-        if result.matched_count == 0:
-            result = await self.sent_requests.update_one(
-                {'request.metadata.messageId': request_id},
-                {'$set': {'status': status.value}}
-            )
+        # The request lives in only one of the collections, update both at once
+        received_result, sent_result = await asyncio.gather(
+            self.received_requests.update_one(query, update),
+            self.sent_requests.update_one(query, update),
+        )
 
-        if result.matched_count == 0:
+        if received_result.matched_count + sent_result.matched_count == 0:
             raise NetworkMessageNotFoundException(
                 f'Request with ID {request_id} not found.'
             )
@@ -1,13 +1,22 @@
+from pymongo import UpdateOne
 from pymongo.asynchronous.database import AsyncDatabase
 from dedi_link.model.node import Node
 
 from dedi_gateway.model.node import NodeRepository
+from .cursor import load_all, prefetch
+from .indexes import ensure_unique_index
+from .repository_cache import RepositoryCache
 
 
 class MongoNodeRepository(NodeRepository):
     """
     MongoDB implementation of the UserRepository interface.
     """
+    # Node.from_dict ignores the ObjectId, so do not fetch or decode it
+    _PROJECTION = {'_id': 0}
+    CACHE_SIZE = 4096
+    CACHE_TTL = 30
+
     def __init__(self,
                  db: AsyncDatabase,
                  ):
@@ -17,20 +26,42 @@ class MongoNodeRepository(NodeRepository):
         """
         self.db = db
         self.collection = db['nodes']
+        self._cache = RepositoryCache(max_size=self.CACHE_SIZE, ttl=self.CACHE_TTL)
+
+    async def ensure_indexes(self):
+        """
+        Create the indexes used to look up nodes by ID and approval.
+        """
+        await ensure_unique_index(self.collection, 'nodeId')
+        await self.collection.create_index('approved')
+
+    async def warm_up(self):
+        """
+        Read every node once, so the server keeps the collection in memory.
+        """
+        async for _ in prefetch(self.collection.find({}, self._PROJECTION)):
+            pass
 
-    async def get(self, node_id: str) -> Node | None:
-        node = await self.collection.find_one({'nodeId': node_id})
+    async def get(self,
+                  node_id: str,
+                  *,
+                  cached: bool = True,
+                  ) -> Node | None:
+        node = self._cache.get(node_id) if cached else None
+
+        if node is None:
+            node = await self.collection.find_one({'nodeId': node_id}, self._PROJECTION)
+
+            if node:
+                self._cache.put(node_id, node)
 
         return Node.from_dict(node) if node else None
 
     async def batch_get(self, node_ids: list[str]) -> list[Node]:
-        cursor = self.collection.find({'nodeId': {'$in': node_ids}})
-
-        nodes = []
-        async for node in cursor:
-            nodes.append(Node.from_dict(node))
+        cursor = self.collection.find({'nodeId': {'$in': node_ids}}, self._PROJECTION)
+        nodes = await cursor.to_list(length=None)
 
-        return nodes
+        return await load_all(nodes, Node.from_dict)
 
     async def filter(self,
                      *,
@@ -40,26 +71,72 @@ class MongoNodeRepository(NodeRepository):
         if approved is not None:
             query['approved'] = approved
 
-        cursor = self.collection.find(query)
-        nodes = []
+        nodes = await self.collection.find(query, self._PROJECTION).to_list(length=None)
 
-        async for node in cursor:
-            nodes.append(Node.from_dict(node))
-
-        return nodes
+        return await load_all(nodes, Node.from_dict)
 
     async def save(self, node: Node) -> None:
+        node_data = node.to_dict()
+
         await self.collection.update_one(
             {'nodeId': node.node_id},
-            {'$set': node.to_dict()},
+            {'$set': node_data},
             upsert=True
         )
+        self._cache.put(node.node_id, node_data)
+
+    async def save_many(self, nodes: list[Node]) -> None:
+        if not nodes:
+            return
+
+        nodes_data = {node.node_id: node.to_dict() for node in nodes}
+
+        await self.collection.bulk_write(
+            [
+                UpdateOne({'nodeId': node_id}, {'$set': node_data}, upsert=True)
+                for node_id, node_data in nodes_data.items()
+            ],
+            ordered=False,
+        )
+
+        for node_id, node_data in nodes_data.items():
+            self._cache.put(node_id, node_data)
 
     async def delete(self, node_id: str) -> None:
         await self.collection.delete_one({'nodeId': node_id})
+        self._cache.invalidate(node_id)
 
     async def update(self, node: Node) -> None:
-        await self.collection.update_one(
+        node_data = node.to_dict()
+
+        result = await self.collection.update_one(
             {'nodeId': node.node_id},
-            {'$set': node.to_dict()}
+            {'$set': node_data}
         )
+
+        if result.matched_count:
+            self._cache.put(node.node_id, node_data)
+        else:
+            self._cache.invalidate(node.node_id)
+
+    async def update_many(self, nodes: list[Node]) -> None:
+        nodes_data = {node.node_id: node.to_dict() for node in nodes}
+
+        if not nodes_data:
+            return
+
+        result = await self.collection.bulk_write(
+            [
+                UpdateOne({'nodeId': node_id}, {'$set': node_data})
+                for node_id, node_data in nodes_data.items()
+            ],
+            ordered=False,
+        )
+
+        # Without knowing which nodes were missing, only cache a complete match
+        if result.matched_count == len(nodes_data):
+            for node_id, node_data in nodes_data.items():
+                self._cache.put(node_id, node_data)
+        else:
+            for node_id in nodes_data:
+                self._cache.invalidate(node_id)
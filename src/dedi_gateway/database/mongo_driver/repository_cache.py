@@ -0,0 +1,81 @@
+import copy
+import time
+from collections import OrderedDict
+
+
+class RepositoryCache:
+    """
+    A bounded least recently used cache of documents read by a repository.
+
+    Entries are invalidated by writes going through the owning repository. Set
+    a TTL to bound how stale an entry can get when other processes write to
+    the same collection.
+    """
+    def __init__(self,
+                 max_size: int = 128,
+                 ttl: float | None = None,
+                 ):
+        """
+        Initialise the RepositoryCache.
+        :param max_size: The maximum number of documents to keep.
+        :param ttl: Seconds an entry stays valid, or None to keep it until evicted.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+
+    def _lookup(self, key: str) -> dict | None:
+        """
+        Get a cached document without copying it, dropping it if expired.
+        :param key: The ID the document was cached under.
+        :return: The cached document, or None if it is not cached.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        document, expires_at = entry
+
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        return document
+
+    def get(self, key: str) -> dict | None:
+        """
+        Get a cached document, marking it as recently used.
+        :param key: The ID the document was cached under.
+        :return: A copy of the cached document, or None if it is not cached.
+        """
+        document = self._lookup(key)
+
+        if document is None:
+            return None
+
+        self._entries.move_to_end(key)
+
+        # Models built from the document keep references to its lists
+        return copy.deepcopy(document)
+
+    def put(self, key: str, document: dict):
+        """
+        Cache a document, evicting the least recently used one if full.
+        :param key: The ID to cache the document under.
+        :param document: The document read from the database.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float('inf')
+
+        self._entries[key] = (copy.deepcopy(document), expires_at)
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        """
+        Drop a cached document after it has been written.
+        :param key: The ID the document was cached under.
+        """
+        self._entries.pop(key, None)
@@ -2,12 +2,19 @@ from pymongo.asynchronous.database import AsyncDatabase
 from dedi_link.model import User
 
 from dedi_gateway.model.user import UserRepository
+from .indexes import ensure_unique_index
+from .repository_cache import RepositoryCache
 
 
 class MongoUserRepository(UserRepository):
     """
     MongoDB implementation of the UserRepository interface.
     """
+    # User.from_dict ignores the ObjectId, so do not fetch or decode it
+    _PROJECTION = {'_id': 0}
+    CACHE_SIZE = 128
+    CACHE_TTL = 30
+
     def __init__(self, db: AsyncDatabase):
         """
         Initialise the MongoUserRepository with a MongoDB database instance.
@@ -15,9 +22,22 @@ class MongoUserRepository(UserRepository):
         """
         self.db = db
         self.collection = db['users']
+        self._cache = RepositoryCache(max_size=self.CACHE_SIZE, ttl=self.CACHE_TTL)
+
+    async def ensure_indexes(self):
+        """
+        Create the index used to look up users by ID.
+        """
+        await ensure_unique_index(self.collection, 'userId')
 
     async def get(self, user_id: str) -> User | None:
-        user_data = await self.collection.find_one({'userId': user_id})
+        user_data = self._cache.get(user_id)
+
+        if user_data is None:
+            user_data = await self.collection.find_one({'userId': user_id}, self._PROJECTION)
+
+            if user_data:
+                self._cache.put(user_id, user_data)
 
         if user_data:
             return User.from_dict(user_data)
@@ -30,12 +50,15 @@ class MongoUserRepository(UserRepository):
             {'$set': user.to_dict()},
             upsert=True
         )
+        self._cache.invalidate(user.user_id)
 
     async def delete(self, user_id: str) -> None:
         await self.collection.delete_one({'userId': user_id})
+        self._cache.invalidate(user_id)
 
     async def update(self, user: User) -> None:
         await self.collection.update_one(
             {'userId': user.user_id},
             {'$set': user.to_dict()}
         )
+        self._cache.invalidate(user.user_id)
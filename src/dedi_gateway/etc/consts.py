@@ -67,11 +67,25 @@ class ServiceConfig(BaseSettings):
         'dedi-gateway',
         description='Name of the MongoDB database to use',
     )
+    mongodb_pool_size: int = Field(
+        100,
+        description='Maximum number of connections in the MongoDB connection pool',
+    )
+    mongodb_compressors: str = Field(
+        '',
+        description='Comma separated wire compressors to offer to MongoDB, '
+                    'in order of preference, empty to disable compression',
+    )
 
     cache_driver: str = Field(
         'redis',
         description='Cache driver to use for the service',
     )
+    cache_max_routes: int = Field(
+        10000,
+        description='Maximum number of routes kept by the in-memory cache, '
+                    'least recently used routes are evicted first',
+    )
     redis_host: str = Field(
         'localhost',
         description='Redis host for the cache',
@@ -80,11 +94,23 @@ class ServiceConfig(BaseSettings):
         6379,
         description='Redis port for the cache',
     )
+    redis_serialiser: str = Field(
+        'json',
+        description='Serialiser for payloads stored in Redis, json or orjson',
+    )
 
     kms_driver: str = Field(
         'vault',
         description='Key Management Service driver to use for the service',
     )
+    kms_key_pool_size: int = Field(
+        2,
+        description='Number of RSA key pairs generated ahead of time, 0 to disable',
+    )
+    kms_public_key_ttl: int = Field(
+        60,
+        description='Seconds a public key read from the KMS is cached, 0 to disable',
+    )
     vault_url: str = Field(
         'http://localhost:8200',
         description='URL for the HashiCorp Vault service',
@@ -110,6 +136,16 @@ class ServiceConfig(BaseSettings):
         'transit',
         description='Transit engine name for the HashiCorp Vault service',
     )
+    vault_local_signing: bool = Field(
+        False,
+        description='Export network node keys from HashiCorp Vault and sign '
+                    'messages in process',
+    )
+    vault_max_rps: int = Field(
+        200,
+        description='Maximum requests per second sent to the HashiCorp Vault service, '
+                    '0 for no limit',
+    )
 
 
 SERVICE_CONFIG = ServiceConfig()        # type: ignore
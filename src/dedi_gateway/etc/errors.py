@@ -6,12 +6,22 @@ Exception definitions for dedi-gateway package
 class DediGatewayException(Exception):
     """
     Base class for all exceptions raised by the service.
+
+    Subclasses only override the class-level defaults, which are used when
+    no message or status code is given.
     """
+    default_message: str | None = None
+    default_status_code: int = 500
 
     def __init__(self,
                  message: str = None,
-                 status_code: int = 500,
+                 status_code: int = None,
                  ):
+        if message is None:
+            message = self.default_message
+        if status_code is None:
+            status_code = self.default_status_code
+
         super().__init__(message)
 
         self.message = message
@@ -22,151 +32,109 @@ class ConfigurationParsingException(DediGatewayException):
     """
     Exception raised when there is an error parsing the configuration.
     """
-    def __init__(self,
-                 message: str = 'Error parsing configuration.',
-                 status_code: int = 400,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Error parsing configuration.'
+    default_status_code = 400
 
 
 class MessageBrokerTimeoutException(DediGatewayException):
     """
     Message broker timeout without receiving a message.
     """
-    def __init__(self,
-                 message: str = 'Message broker timeout without receiving a message.',
-                 status_code: int = 504,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Message broker timeout without receiving a message.'
+    default_status_code = 504
 
 
 class KmsKeyManagementException(DediGatewayException):
     """
     Exception raised when there is an error with KMS key management.
     """
-    def __init__(self,
-                 message: str = 'Error managing KMS keys.',
-                 status_code: int = 500,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Error managing KMS keys.'
+    default_status_code = 500
 
 
 class NetworkRequestFailedException(DediGatewayException):
     """
     Exception raised when a network request fails.
     """
-    def __init__(self,
-                 message: str = 'Network request failed.',
-                 status_code: int = 502,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Network request failed.'
+    default_status_code = 502
 
 
 class JoiningNetworkException(DediGatewayException):
     """
     Exception raised when joining a network fails.
     """
-    def __init__(self,
-                 message: str = 'Failed to join the network.',
-                 status_code: int = 503,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Failed to join the network.'
+    default_status_code = 503
 
 
 class InvitingNodeException(DediGatewayException):
     """
     Exception raised when inviting a node to a network fails.
     """
-    def __init__(self,
-                 message: str = 'Failed to invite the node to the network.',
-                 status_code: int = 503,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Failed to invite the node to the network.'
+    default_status_code = 503
 
 
 class NetworkNotFoundException(DediGatewayException):
     """
     Exception raised when a network is not found.
     """
-    def __init__(self,
-                 message: str = 'Network not found.',
-                 status_code: int = 404,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Network not found.'
+    default_status_code = 404
 
 
 class NodeNotFoundException(DediGatewayException):
     """
     Exception raised when a node is not found.
     """
-    def __init__(self,
-                 message: str = 'Node not found.',
-                 status_code: int = 404,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Node not found.'
+    default_status_code = 404
 
 
 class NodeNotApprovedException(DediGatewayException):
     """
     Exception raised when a node is not approved to join a network.
     """
-    def __init__(self,
-                 message: str = 'Node not approved to communicate with this service.',
-                 status_code: int = 403,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Node not approved to communicate with this service.'
+    default_status_code = 403
 
 
 class NodeNotConnectedException(DediGatewayException):
     """
     Exception raised when a node is not connected to the network.
     """
-    def __init__(self,
-                 message: str = 'Node is not connected to the network.',
-                 status_code: int = 503,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Node is not connected to the network.'
+    default_status_code = 503
 
 
 class NetworkMessageNotFoundException(DediGatewayException):
     """
     Exception raised when a network message is not found.
     """
-    def __init__(self,
-                 message: str = 'Network message not found.',
-                 status_code: int = 404,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Network message not found.'
+    default_status_code = 404
 
 
 class NetworkMessageSignatureException(DediGatewayException):
     """
     Exception raised when a network message signature is invalid.
     """
-    def __init__(self,
-                 message: str = 'Network message signature is invalid.',
-                 status_code: int = 400,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Network message signature is invalid.'
+    default_status_code = 400
 
 
 class MessageConfigurationNotFoundException(DediGatewayException):
     """
     Exception raised when a message configuration is not found.
     """
-    def __init__(self,
-                 message: str = 'Message configuration not found.',
-                 status_code: int = 404,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Message configuration not found.'
+    default_status_code = 404
 
 
 class MessageConfigurationParsingException(DediGatewayException):
     """
     Exception raised when there is an error parsing a message configuration.
     """
-    def __init__(self,
-                 message: str = 'Error parsing message configuration.',
-                 status_code: int = 400,
-                 ):
-        super().__init__(message, status_code)
+    default_message = 'Error parsing message configuration.'
+    default_status_code = 400
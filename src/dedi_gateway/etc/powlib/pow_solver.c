@@ -1,10 +1,16 @@
 #include <stdio.h>
 #include <stdint.h>
 #include <string.h>
+#include <limits.h>
+#include <stdatomic.h>
+#include <pthread.h>
+#include <unistd.h>
 #include <openssl/sha.h>
 
 #define MAX_DIFFICULTY 256
 #define MAX_ITERATIONS 1000000000ULL
+#define MAX_THREADS 64
+#define SEARCH_BLOCK 4096ULL
 
 static int check_difficulty(const unsigned char *hash, int difficulty) {
     int full_bytes = difficulty / 8;
@@ -24,24 +30,121 @@ static int check_difficulty(const unsigned char *hash, int difficulty) {
     return 1;
 }
 
-int solve_pow(const char *nonce, int difficulty, unsigned long long *result) {
-    if (!nonce || difficulty < 1 || difficulty > MAX_DIFFICULTY)
-        return 1;
+/*
+ * Check a single response. Returns 1 if valid, 0 if not, and -1 if the
+ * arguments cannot be handled here and the caller should check it itself.
+ */
+int validate_pow(const char *nonce, int difficulty, unsigned long long response) {
+    if (!nonce || difficulty < 0 || difficulty > MAX_DIFFICULTY)
+        return -1;
 
     char buffer[512];
     unsigned char hash[SHA256_DIGEST_LENGTH];
 
-    for (unsigned long long counter = 0; counter < MAX_ITERATIONS; ++counter) {
-        int len = snprintf(buffer, sizeof(buffer), "%s%llu", nonce, counter);
-        if (len < 0 || len >= sizeof(buffer)) return 1;
+    int len = snprintf(buffer, sizeof(buffer), "%s%llu", nonce, response);
+    if (len < 0 || len >= sizeof(buffer)) return -1;
 
-        SHA256((unsigned char *)buffer, len, hash);
+    SHA256((unsigned char *)buffer, len, hash);
 
-        if (check_difficulty(hash, difficulty)) {
-            *result = counter;
-            return 0;
+    return check_difficulty(hash, difficulty);
+}
+
+/*
+ * Write a counter in ASCII decimal, the same digits as "%llu", and return
+ * the number of characters written. The buffer must hold 20 characters.
+ */
+static int format_counter(unsigned long long counter, char *out) {
+    char digits[20];
+    int len = 0;
+
+    do {
+        digits[len++] = (char)('0' + counter % 10);
+        counter /= 10;
+    } while (counter);
+
+    for (int i = 0; i < len; ++i)
+        out[i] = digits[len - 1 - i];
+
+    return len;
+}
+
+typedef struct {
+    SHA256_CTX prefix;
+    int difficulty;
+    _Atomic unsigned long long next_block;
+    _Atomic unsigned long long best;
+} search_state;
+
+/*
+ * Worker thread: claim blocks of counters in increasing order and record the
+ * lowest solution found. A thread stops once every block it could still claim
+ * starts above the best solution so far, so the result is always the lowest
+ * valid counter, exactly as a sequential search would return.
+ */
+static void *search_blocks(void *arg) {
+    search_state *state = arg;
+    char digits[20];
+    unsigned char hash[SHA256_DIGEST_LENGTH];
+    SHA256_CTX ctx;
+
+    for (;;) {
+        unsigned long long start = atomic_fetch_add(&state->next_block, SEARCH_BLOCK);
+        if (start >= MAX_ITERATIONS || start >= atomic_load(&state->best))
+            break;
+
+        unsigned long long end = start + SEARCH_BLOCK;
+        if (end > MAX_ITERATIONS) end = MAX_ITERATIONS;
+
+        for (unsigned long long counter = start; counter < end; ++counter) {
+            // Resume from the state with the nonce already absorbed
+            ctx = state->prefix;
+            SHA256_Update(&ctx, digits, format_counter(counter, digits));
+            SHA256_Final(hash, &ctx);
+
+            if (check_difficulty(hash, state->difficulty)) {
+                unsigned long long best = atomic_load(&state->best);
+                while (counter < best &&
+                       !atomic_compare_exchange_weak(&state->best, &best, counter));
+                break;
+            }
         }
     }
 
-    return 1;  // No solution found
+    return NULL;
+}
+
+int solve_pow(const char *nonce, int difficulty, unsigned long long *result) {
+    if (!nonce || difficulty < 1 || difficulty > MAX_DIFFICULTY)
+        return 1;
+    search_state state = {
+        .difficulty = difficulty,
+        .next_block = 0,
+        .best = ULLONG_MAX,
+    };
+
+    // Every candidate starts with the nonce, hash it once for all of them
+    SHA256_Init(&state.prefix);
+    SHA256_Update(&state.prefix, nonce, strlen(nonce));
+
+    long cpus = sysconf(_SC_NPROCESSORS_ONLN);
+    int threads = cpus < 1 ? 1 : (cpus > MAX_THREADS ? MAX_THREADS : (int)cpus);
+    pthread_t workers[MAX_THREADS];
+    int started = 0;
+
+    for (; started < threads - 1; ++started) {
+        if (pthread_create(&workers[started], NULL, search_blocks, &state) != 0)
+            break;
+    }
+
+    // The calling thread searches too, so this works even if no thread started
+    search_blocks(&state);
+
+    for (int i = 0; i < started; ++i)
+        pthread_join(workers[i], NULL);
+
+    if (state.best == ULLONG_MAX)
+        return 1;  // No solution found
+
+    *result = state.best;
+    return 0;
 }
@@ -1,5 +1,10 @@
+import os
 import sys
+import asyncio
 import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 import importlib.resources as pkg_resources
 from cffi import FFI
 
@@ -8,15 +13,94 @@ from ..consts import LOGGER
 ffi = FFI()
 ffi.cdef("""
     int solve_pow(const char *nonce, int difficulty, unsigned long long *result);
+    int validate_pow(const char *nonce, int difficulty, unsigned long long response);
 """)
 
 
+def _load_lib():
+    """
+    Load the native proof of work library for this platform.
+    :return: The Lib object from CFFI interface, pointing to the native library.
+    """
+    if sys.platform == 'win32':
+        raise RuntimeError("Native library is not available on Windows")
+    elif sys.platform == 'darwin':
+        raise RuntimeError("Native library is not available on macOS")
+    else:
+        lib_name = 'libpow.so'
+
+    lib_path = pkg_resources.files('dedi_gateway.data.bin') / lib_name
+
+    return ffi.dlopen(str(lib_path))
+
+
+# Resolve the library once, keeping the error to raise when it is used
+try:
+    _LIB = _load_lib()
+    _LIB_ERROR = None
+except (OSError, RuntimeError) as e:
+    _LIB = None
+    _LIB_ERROR = e
+
+# Libraries built before validate_pow was added only export solve_pow
+_VALIDATE_POW = getattr(_LIB, 'validate_pow', None)
+
+# One result pointer per thread, so concurrent solves do not share it
+_LOCAL = threading.local()
+
+# Counters searched per task by the Python fallback
+_SEARCH_CHUNK = 1 << 16
+_SEARCH_SPACE = 1 << 64
+
+
+def _search_range(task: tuple[str, int, int, int]) -> int | None:
+    """
+    Search a contiguous range of counters for a proof of work solution.
+    :param task: A tuple of the nonce, the difficulty, and the start and
+        end of the range to search, end exclusive.
+    :return: The lowest valid counter in the range, or None if there is none.
+    """
+    nonce, difficulty, start, stop = task
+    zero_prefix, shift = _zero_prefix(difficulty)
+    full = len(zero_prefix)
+    # The nonce prefixes every candidate, absorb it once and copy the state
+    base = hashlib.sha256(nonce.encode())
+
+    for counter in range(start, stop):
+        h = base.copy()
+        h.update(b'%d' % counter)
+        digest = h.digest()
+
+        if digest[:full] == zero_prefix and (not shift or digest[full] >> shift == 0):
+            return counter
+
+    return None
+
+
+def _zero_prefix(difficulty: int) -> tuple[bytes, int]:
+    """
+    Split a difficulty into the digest bytes that must be zero and the
+    shift that leaves only the required leading bits of the byte after them.
+    :param difficulty: How many leading zero bits the hash should have.
+    :return: A tuple of the zero byte prefix and the shift for the next byte,
+        or 0 if the difficulty is a whole number of bytes.
+    """
+    full, rem = divmod(difficulty, 8)
+
+    return b'\x00' * full, 8 - rem if rem else 0
+
+
 class PowDriver:
     """
     A class to handle proof of work challenges using a native C library,
     falling back to Python implementation if the library is not available.
     """
-    _lib = None
+    # Each native solve already searches on every core, so only a couple run at once
+    MAX_CONCURRENT_SOLVES = 2
+    _executor = ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_SOLVES,
+        thread_name_prefix='pow',
+    )
 
     @property
     def lib(self):
@@ -24,18 +108,10 @@ class PowDriver:
         C library getter.
         :return: The Lib object from CFFI interface, pointing to the native library.
         """
-        if self._lib is None:
-            if sys.platform == 'win32':
-                raise RuntimeError("Native library is not available on Windows")
-            elif sys.platform == 'darwin':
-                raise RuntimeError("Native library is not available on macOS")
-            else:
-                lib_name = 'libpow.so'
+        if _LIB is None:
+            raise RuntimeError('libpow unavailable') from _LIB_ERROR
 
-            lib_path = pkg_resources.files('dedi_gateway.data.bin') / lib_name
-            PowDriver._lib = ffi.dlopen(str(lib_path))
-
-        return self._lib
+        return _LIB
 
     def _c_solve(self, nonce: str, difficulty: int) -> int:
         """
@@ -50,8 +126,13 @@ class PowDriver:
         if not isinstance(nonce, str) or not isinstance(difficulty, int):
             raise TypeError('Expected nonce: str and difficulty: int')
 
-        res_ptr = ffi.new('unsigned long long *')
-        ret = self.lib.solve_pow(nonce.encode('utf-8'), difficulty, res_ptr)
+        lib = self.lib
+        res_ptr = getattr(_LOCAL, 'res_ptr', None)
+
+        if res_ptr is None:
+            res_ptr = _LOCAL.res_ptr = ffi.new('unsigned long long *')
+
+        ret = lib.solve_pow(nonce.encode('utf-8'), difficulty, res_ptr)
 
         if ret != 0:
             raise RuntimeError('PoW solving failed')
@@ -73,15 +154,32 @@ class PowDriver:
         if difficulty < 1 or difficulty > 256:
             raise ValueError('Difficulty must be between 1 and 256')
 
-        target_prefix = '0' * difficulty
-
-        for counter in range(1 << 64):  # covers entire 64-bit unsigned range
-            data = f"{nonce}{counter}".encode()
-            digest = hashlib.sha256(data).hexdigest()
-            bin_hash = bin(int(digest, 16))[2:].zfill(256)
-
-            if bin_hash.startswith(target_prefix):
-                return counter
+        # Easy challenges are solved well within the first chunk, before a
+        # process pool would even have started
+        counter = _search_range((nonce, difficulty, 0, _SEARCH_CHUNK))
+        if counter is not None:
+            return counter
+
+        workers = os.cpu_count() or 1
+        wave = workers * 4
+
+        # Spawn rather than fork, this may run in a thread of the event loop process
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            # Search the chunks in waves, in order, so the lowest valid counter
+            # is returned just like the sequential search would
+            for wave_start in range(_SEARCH_CHUNK, _SEARCH_SPACE, wave * _SEARCH_CHUNK):
+                tasks = [
+                    (nonce, difficulty, start, min(start + _SEARCH_CHUNK, _SEARCH_SPACE))
+                    for start in range(
+                        wave_start,
+                        min(wave_start + wave * _SEARCH_CHUNK, _SEARCH_SPACE),
+                        _SEARCH_CHUNK,
+                    )
+                ]
+
+                for counter in pool.map(_search_range, tasks):
+                    if counter is not None:
+                        return counter
 
         raise RuntimeError("No valid nonce found within 64-bit search space")
 
@@ -92,15 +190,31 @@ class PowDriver:
         :param difficulty: How many leading zeros the hash should have.
         :return: The valid nonce that solves the challenge.
         """
-        try:
-            return self._c_solve(nonce, difficulty)
-        except OSError:
-            LOGGER.exception(
+        # Only a missing library falls back, native solve failures propagate
+        if _LIB is None:
+            LOGGER.warning(
                 'libpow C library is not available, '
-                'falling back to Python implementation.'
+                'falling back to Python implementation: %s',
+                _LIB_ERROR,
             )
             return self._python_solve(nonce, difficulty)
 
+        return self._c_solve(nonce, difficulty)
+
+    async def solve_async(self, nonce: str, difficulty: int) -> int:
+        """
+        Solve a proof of work challenge without blocking the event loop.
+        :param nonce: The nonce to use for the proof of work challenge.
+        :param difficulty: How many leading zeros the hash should have.
+        :return: The valid nonce that solves the challenge.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            self.solve,
+            nonce,
+            difficulty,
+        )
+
     def validate(self,
                  nonce: str,
                  difficulty: int,
@@ -113,10 +227,25 @@ class PowDriver:
         :param response: The response to validate against the challenge.
         :return: True if the response is valid, False otherwise.
         """
-        data = f'{nonce}{response}'.encode()
-        h = hashlib.sha256(data).hexdigest()
-        bin_hash = bin(int(h, 16))[2:].zfill(256)
+        if difficulty > 256:
+            return False
+
+        difficulty = max(difficulty, 0)
+
+        # bool is an int subclass, but is never a valid native response
+        native = isinstance(response, int) and not isinstance(response, bool)
+
+        if _VALIDATE_POW is not None and native and 0 <= response < _SEARCH_SPACE:
+            valid = _VALIDATE_POW(nonce.encode('utf-8'), difficulty, response)
+
+            if valid >= 0:
+                return bool(valid)
 
-        target = '0' * difficulty
+        zero_prefix, shift = _zero_prefix(difficulty)
+        full = len(zero_prefix)
+        # Same ASCII decimal encoding of the counter as the C solver uses
+        h = hashlib.sha256(nonce.encode())
+        h.update(str(response).encode())
+        digest = h.digest()
 
-        return bin_hash.startswith(target)
+        return digest[:full] == zero_prefix and (not shift or digest[full] >> shift == 0)
@@ -1,8 +1,9 @@
+import asyncio
 import json
 import random
 from datetime import datetime, timedelta
-from functools import wraps
-from quart import jsonify, websocket, has_websocket_context
+from functools import lru_cache, wraps
+from quart import Response, websocket, has_websocket_context
 from werkzeug.exceptions import HTTPException
 
 from dedi_gateway.etc.consts import LOGGER, SCHEDULER
@@ -10,6 +11,44 @@ from dedi_gateway.etc.errors import DediGatewayException
 from dedi_gateway.database import get_active_db
 from dedi_gateway.model.network_interface import SyncInterface, establish_all_connections
 
+# Maximum number of networks synchronised at the same time
+SYNC_CONCURRENCY = 8
+
+
+@lru_cache(maxsize=256)
+def _error_body(error: str | None) -> str:
+    """
+    Serialise an error message into the JSON body sent to clients. Most errors
+    carry their default message, so the body is reused for repeated errors.
+    :param error: The error message.
+    :return: The JSON body.
+    """
+    return json.dumps({'error': error})
+
+
+async def _emit_error(error: str | None,
+                      status_code: int,
+                      close_code: int,
+                      ) -> Response | None:
+    """
+    Send an error to the client over the current websocket, or build the
+    HTTP error response from a cached JSON body.
+    :param error: The error message.
+    :param status_code: The HTTP status code.
+    :param close_code: The code to close the websocket with.
+    :return: The response object, or None if the error was sent over a websocket.
+    """
+    if has_websocket_context():
+        await websocket.send(_error_body(error))
+        await websocket.close(code=close_code)
+        return None
+
+    response = Response(_error_body(error), status=status_code, mimetype='application/json')
+    if status_code == 401:
+        response.headers['WWW-Authenticate'] = 'Signature realm="dedi-link"'
+
+    return response
+
 
 def exception_handler(f):
     @wraps(f)
@@ -17,140 +56,164 @@ def exception_handler(f):
         try:
             return await f(*args, **kwargs)
         except DediGatewayException as e:
-            message = {'error': e.message}
-            status_code = e.status_code
-
             LOGGER.exception('Dedi Gateway Exception: %s', e.message)
 
-            if has_websocket_context():
-                await websocket.send(json.dumps(message))
-                await websocket.close(code=4000 + status_code)
-                return
-            else:
-                response = jsonify(message)
-                response.status_code = status_code
-                if status_code == 401:
-                    response.headers['WWW-Authenticate'] = 'Signature realm="dedi-link"'
-                return response
+            return await _emit_error(e.message, e.status_code, 4000 + e.status_code)
 
         except HTTPException as e:
-            message = {'error': e.description}
-            LOGGER.exception('HTTP Exception: %s', e.description)
-
-            if has_websocket_context():
-                await websocket.send(json.dumps(message))
-                await websocket.close(code=4000 + e.code)
-                return
+            # Client errors come from probing or malformed requests, a traceback
+            # for each one only costs formatting time and log volume
+            if e.code < 500:
+                LOGGER.warning('HTTP Exception: %s', e.description)
+            else:
+                LOGGER.exception('HTTP Exception: %s', e.description)
 
-            response = jsonify(message)
-            response.status_code = e.code
-            return response
+            return await _emit_error(e.description, e.code, 4000 + e.code)
 
         except Exception as e:
-            message = {'error': str(e)}
             LOGGER.exception('Internal Server Error')
 
-            if has_websocket_context():
-                await websocket.send(json.dumps(message))
-                await websocket.close(code=4500)
-                return
-
-            response = jsonify(message)
-            response.status_code = 500
-            return response
+            return await _emit_error(str(e), 500, 4500)
 
     return wrapper
 
 
-async def sync_all_nodes():
+async def sync_all_nodes(interface: SyncInterface = None):
     """
     Sync all nodes in all networks with the latest data.
-    :return:
+    :param interface: The interface to sync through, reused across runs.
     """
     try:
         db = get_active_db()
-        interface = SyncInterface()
-
-        networks = await db.networks.filter()
-
-        for network in networks:
-            try:
-                LOGGER.info('Syncing network %s', network.network_id)
-                await interface.sync_known_nodes(network.network_id)
-                LOGGER.info('Synchronised network %s successfully', network.network_id)
-            except DediGatewayException as e:
-                LOGGER.exception('Failed to sync network %s: %s', network.network_id, e.message)
-            except Exception:
-                LOGGER.exception('Unexpected error while syncing network %s', network.network_id)
+        interface = interface or SyncInterface()
+
+        semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+
+        async def sync_network(network):
+            async with semaphore:
+                try:
+                    LOGGER.info('Syncing network %s', network.network_id)
+                    await interface.sync_known_nodes(network.network_id)
+                    LOGGER.info('Synchronised network %s successfully', network.network_id)
+                except DediGatewayException as e:
+                    LOGGER.exception(
+                        'Failed to sync network %s: %s',
+                        network.network_id,
+                        e.message
+                    )
+                except Exception:
+                    LOGGER.exception(
+                        'Unexpected error while syncing network %s',
+                        network.network_id
+                    )
+
+        # Networks are independent, start syncing each as soon as it is read
+        async with asyncio.TaskGroup() as tg:
+            async for network in db.networks.iter():
+                tg.create_task(sync_network(network))
     except Exception:
         LOGGER.exception('Synchronisation interrupted, not all networks were synced')
 
 
-async def sync_all_index():
+async def sync_all_index(interface: SyncInterface = None):
     """
     Sync all data indices across all networks.
+    :param interface: The interface to sync through, reused across runs.
     """
     try:
         db = get_active_db()
-        interface = SyncInterface()
-
-        networks = await db.networks.filter()
-
-        for network in networks:
-            try:
-                LOGGER.info('Syncing data index for network %s', network.network_id)
-                await interface.sync_data_index(network.network_id)
-                LOGGER.info(
-                    'Data index for network %s synchronised successfully',
-                    network.network_id
-                )
-            except DediGatewayException as e:
-                LOGGER.exception(
-                    'Failed to sync data index for network %s: %s',
-                    network.network_id,
-                    e.message
-                )
-            except Exception:
-                LOGGER.exception(
-                    'Unexpected error while syncing data index for network %s',
-                    network.network_id
-                )
+        interface = interface or SyncInterface()
+
+        semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+
+        async def sync_network_index(network):
+            async with semaphore:
+                try:
+                    LOGGER.info('Syncing data index for network %s', network.network_id)
+                    await interface.sync_data_index(network.network_id)
+                    LOGGER.info(
+                        'Data index for network %s synchronised successfully',
+                        network.network_id
+                    )
+                except DediGatewayException as e:
+                    LOGGER.exception(
+                        'Failed to sync data index for network %s: %s',
+                        network.network_id,
+                        e.message
+                    )
+                except Exception:
+                    LOGGER.exception(
+                        'Unexpected error while syncing data index for network %s',
+                        network.network_id
+                    )
+
+        # Networks are independent, start syncing each as soon as it is read
+        async with asyncio.TaskGroup() as tg:
+            async for network in db.networks.iter():
+                tg.create_task(sync_network_index(network))
     except Exception:
         LOGGER.exception(
             'Synchronisation of data indices interrupted, not all networks were synced'
         )
 
 
+async def warm_up_database():
+    """
+    Touch frequently used data so the database keeps it in memory.
+    """
+    try:
+        await get_active_db().warm_up()
+    except Exception:
+        LOGGER.exception('Failed to warm up the database')
+
+
 def scheduler_add_initial_jobs():
     """
     Add jobs that are tied to application cycle, and should be run regardless of
     the operations handled.
     """
+    # One interface, and so one HTTP connection pool, shared by every run
+    sync_interface = SyncInterface()
+
     # Establish all connections to nodes every 5 minutes
     SCHEDULER.add_job(
         establish_all_connections,
         'interval',
+        args=(sync_interface,),
         minutes=5,
         id='establish_all_connections',
         replace_existing=True
     )
 
-    # Sync with all networks every 24 hours
-    next_run_time = datetime.now() + timedelta(seconds=random.randint(0, 300))
+    # Warm up the database now and every 10 minutes
+    SCHEDULER.add_job(
+        warm_up_database,
+        'interval',
+        minutes=10,
+        id='warm_up_database',
+        replace_existing=True,
+        next_run_time=datetime.now()
+    )
 
+    # Sync with all networks every 24 hours, each job with its own random
+    # offset so the two syncs do not fire together
     SCHEDULER.add_job(
         sync_all_nodes,
         'interval',
+        args=(sync_interface,),
         hours=24,
+        jitter=300,
         id='sync_all_nodes',
         replace_existing=True,
-        next_run_time=next_run_time
+        next_run_time=datetime.now() + timedelta(seconds=random.randint(0, 300))
     )
     SCHEDULER.add_job(
         sync_all_index,
         'interval',
+        args=(sync_interface,),
         hours=24,
+        jitter=300,
         id='sync_all_index',
         replace_existing=True,
-        next_run_time=next_run_time
+        next_run_time=datetime.now() + timedelta(seconds=random.randint(0, 300))
     )
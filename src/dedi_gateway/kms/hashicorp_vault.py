@@ -2,29 +2,49 @@
 HashiCorp Vault Key Management Service (KMS) implementation.
 
 This file contains implementation of the Kms interface, with the
-HashiCorp Vault as the backend.
+HashiCorp Vault as the backend. Vault is accessed through its HTTP API
+with an asynchronous client, so requests do not block the event loop.
 """
 
+import asyncio
 import base64
-import hvac
-from hvac.exceptions import InvalidRequest, InvalidPath
+import random
+import httpx
+from cryptography.hazmat.primitives import serialization, hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
 
-from dedi_gateway.etc.consts import SERVICE_CONFIG
+from dedi_gateway.etc.consts import SERVICE_CONFIG, LOGGER
 from dedi_gateway.etc.errors import KmsKeyManagementException
 from .kms import Kms
+from .rate_limiter import AsyncLimiter
 
 
 class HcvKms(Kms):
     """
     HashiCorp Vault Key Management Service (KMS) implementation.
     """
-    _client: hvac.Client = None
+    __slots__ = ('_signing_keys',)
+
+    _client: httpx.AsyncClient = None
+    _token: str | None = None
+    _login_lock = asyncio.Lock()
+    _limiter = AsyncLimiter(SERVICE_CONFIG.vault_max_rps) \
+        if SERVICE_CONFIG.vault_max_rps > 0 else None
+    RETRY_STATUS_CODES = (429, 503)
+    MAX_RETRIES = 4
+    RETRY_BACKOFF_BASE = 0.1
+    RETRY_BACKOFF_CAP = 2.0
+
+    def __init__(self):
+        super().__init__()
+        self._signing_keys: dict[str, RSAPrivateKey | None] = {}
 
     @property
-    def client(self) -> hvac.Client:
+    def client(self) -> httpx.AsyncClient:
         """
-        Get the HashiCorp Vault client instance.
-        :return: The hvac.Client instance.
+        Get the HTTP client connected to HashiCorp Vault.
+        :return: The httpx.AsyncClient instance.
         """
         if self._client is None:
             raise ValueError('HashiCorp Vault client is not set. Call set_client() first.')
@@ -32,13 +52,134 @@ class HcvKms(Kms):
 
     @classmethod
     def set_client(cls,
-                   client: hvac.Client,
+                   client: httpx.AsyncClient,
                    ):
         """
-        Set the HashiCorp Vault client for the KMS.
-        :param client: hvac.Client instance configured to connect to HashiCorp Vault.
+        Set the HTTP client for the KMS. The client logs in with AppRole
+        on the first request.
+        :param client: httpx.AsyncClient instance with its base URL set to
+            the HashiCorp Vault address.
         """
         cls._client = client
+        cls._token = None
+
+    async def _send(self,
+                    method: str,
+                    path: str,
+                    **kwargs,
+                    ) -> httpx.Response:
+        """
+        Send a single request to the HashiCorp Vault HTTP API, shaped by
+        the shared rate limiter.
+        :param method: The HTTP method to use.
+        :param path: The API path, relative to /v1/.
+        :param kwargs: Additional arguments passed to httpx, such as json or params.
+        :return: The HTTP response.
+        """
+        if HcvKms._limiter is not None:
+            await HcvKms._limiter.acquire()
+
+        try:
+            return await self.client.request(
+                method,
+                f'/v1/{path}',
+                **kwargs,
+            )
+        except httpx.RequestError as e:
+            raise KmsKeyManagementException(
+                'Unable to reach HashiCorp Vault.',
+            ) from e
+
+    async def _get_token(self) -> str:
+        """
+        Get the Vault token, logging in with AppRole if there is none yet.
+        :return: The Vault client token.
+        """
+        if HcvKms._token is not None:
+            return HcvKms._token
+
+        async with HcvKms._login_lock:
+            if HcvKms._token is None:
+                response = await self._send(
+                    'POST',
+                    'auth/approle/login',
+                    json={
+                        'role_id': SERVICE_CONFIG.vault_role_id,
+                        'secret_id': SERVICE_CONFIG.vault_secret_id,
+                    },
+                )
+
+                if response.is_error:
+                    raise KmsKeyManagementException(
+                        'Unable to authenticate to HashiCorp Vault with AppRole.',
+                    )
+
+                HcvKms._token = response.json()['auth']['client_token']
+
+        return HcvKms._token
+
+    async def _request(self,
+                       method: str,
+                       path: str,
+                       not_found_message: str,
+                       **kwargs,
+                       ) -> dict:
+        """
+        Send a request to the HashiCorp Vault HTTP API, retrying with
+        exponential backoff while Vault is overloaded.
+        :param method: The HTTP method to use.
+        :param path: The API path, relative to /v1/.
+        :param not_found_message: The error message if Vault responds with 404.
+        :param kwargs: Additional arguments passed to httpx, such as json or params.
+        :return: The response body, or an empty dictionary if there is none.
+        """
+        logged_in_again = False
+        retries = 0
+
+        while True:
+            token = await self._get_token()
+            response = await self._send(
+                method,
+                path,
+                headers={'X-Vault-Token': token},
+                **kwargs,
+            )
+
+            if response.status_code == 403 and not logged_in_again:
+                # The token may have expired, log in again and retry once
+                logged_in_again = True
+                if HcvKms._token == token:
+                    HcvKms._token = None
+                continue
+
+            if response.status_code in self.RETRY_STATUS_CODES and retries < self.MAX_RETRIES:
+                delay = min(self.RETRY_BACKOFF_CAP, self.RETRY_BACKOFF_BASE * 2 ** retries)
+                retries += 1
+
+                LOGGER.warning(
+                    'HashiCorp Vault responded with %d, retrying in %.2f seconds',
+                    response.status_code,
+                    delay,
+                )
+                await asyncio.sleep(delay + random.uniform(0, self.RETRY_BACKOFF_BASE))
+                continue
+
+            break
+
+        if response.status_code == 404:
+            raise KmsKeyManagementException(
+                not_found_message,
+                status_code=404,
+            )
+        if response.is_error:
+            raise KmsKeyManagementException(
+                f'HashiCorp Vault request to {path} failed with status {response.status_code}.',
+            )
+
+        if response.status_code == 204 or not response.content:
+            return {}
+
+        return response.json()
 
     async def _read_transit_public_key(self,
                                        key_name: str,
@@ -50,30 +191,26 @@ class HcvKms(Kms):
         :param previous_version: If True, retrieves the previous version of the secret.
         :return: The secret data as a dictionary.
         """
-        try:
-            key_info = self.client.secrets.transit.read_key(
-                name=key_name,
-                mount_point=SERVICE_CONFIG.vault_transit_engine,
-            )
-
-            versions = map(int, key_info['data']['keys'].keys())
-            latest_version = max(versions)
+        key_info = await self._request(
+            'GET',
+            f'{SERVICE_CONFIG.vault_transit_engine}/keys/{key_name}',
+            not_found_message=f'Key {key_name} not found in HashiCorp Vault.',
+        )
 
-            if previous_version:
-                latest_version -= 1
+        # Vault reports the newest key version as latest_version
+        version = int(key_info['data']['latest_version'])
+        if previous_version:
+            version -= 1
 
-            if latest_version < 1:
-                raise KmsKeyManagementException(
-                    f'No previous version of key {key_name} found in HashiCorp Vault.',
-                    status_code=404,
-                )
+        key_versions = key_info['data']['keys']
 
-            return key_info['data']['keys'][str(latest_version)]['public_key']
-        except (InvalidPath, ValueError) as e:
+        if version < 1 or str(version) not in key_versions:
             raise KmsKeyManagementException(
-                f'Key {key_name} not found in HashiCorp Vault.',
+                f'No previous version of key {key_name} found in HashiCorp Vault.',
                 status_code=404,
-            ) from e
+            )
+
+        return key_versions[str(version)]['public_key']
 
     async def _read_kv_secret(self,
                               path: str,
@@ -81,63 +218,92 @@ class HcvKms(Kms):
                               ) -> dict:
         """
         Helper method to read a secret from the HashiCorp Vault KV store.
-        :param path: The path to the secret in the KV store.
+        :param path: The path to the secret, relative to the service root path.
         :param previous_version: If True, retrieves the previous version of the secret.
         :return: The secret data as a dictionary.
         """
-        try:
-            # Read the secret metadata to determine the latest version
-            secret_metadata = (self.client.secrets.kv.read_secret_metadata(
-                path=f'{SERVICE_CONFIG.vault_kv_path}/{path}',
-                mount_point=SERVICE_CONFIG.vault_kv_engine,
-            ))
-
-            latest_version = max([int(v) for v in secret_metadata['versions'].keys()])
-            if previous_version:
-                latest_version -= 1
-
-            if latest_version < 1:
-                raise KmsKeyManagementException(
-                    f'Unable to find previous version of secret {path} in HashiCorp Vault.',
-                    status_code=404,
-                )
-
-            # Read the specific version of the secret
-            secret = self.client.secrets.kv.v2.read_secret_version(
-                path=f'{SERVICE_CONFIG.vault_kv_path}/{path}',
-                version=latest_version,
-                mount_point=SERVICE_CONFIG.vault_kv_engine,
+        secret_path = f'{SERVICE_CONFIG.vault_kv_path}/{path}'
+
+        if not previous_version:
+            # Without a version, Vault returns the latest one in a single call
+            secret = await self._request(
+                'GET',
+                f'{SERVICE_CONFIG.vault_kv_engine}/data/{secret_path}',
+                not_found_message=f'Secret {path} not found in HashiCorp Vault.',
             )
 
             return secret['data']['data']
-        except InvalidPath as e:
+
+        # Read the secret metadata to determine the previous version
+        secret_metadata = await self._request(
+            'GET',
+            f'{SERVICE_CONFIG.vault_kv_engine}/metadata/{secret_path}',
+            not_found_message=f'Secret {path} not found in HashiCorp Vault.',
+        )
+
+        # Vault reports the newest secret version as current_version
+        version = int(secret_metadata['data']['current_version']) - 1
+
+        if version < 1:
             raise KmsKeyManagementException(
-                f'Secret {path} not found in HashiCorp Vault.',
+                f'Unable to find previous version of secret {path} in HashiCorp Vault.',
                 status_code=404,
-            ) from e
+            )
+
+        # Read the previous version of the secret
+        secret = await self._request(
+            'GET',
+            f'{SERVICE_CONFIG.vault_kv_engine}/data/{secret_path}',
+            not_found_message=f'Secret {path} not found in HashiCorp Vault.',
+            params={'version': version},
+        )
+
+        return secret['data']['data']
+
+    async def _write_kv_secret(self,
+                               path: str,
+                               secret: dict,
+                               ):
+        """
+        Helper method to write a new version of a secret to the HashiCorp Vault KV store.
+        :param path: The path to the secret, relative to the service root path.
+        :param secret: The secret data to write.
+        """
+        await self._request(
+            'POST',
+            f'{SERVICE_CONFIG.vault_kv_engine}/data/{SERVICE_CONFIG.vault_kv_path}/{path}',
+            not_found_message=f'KV engine {SERVICE_CONFIG.vault_kv_engine} '
+                              f'not found in HashiCorp Vault.',
+            json={'data': secret},
+        )
 
     async def generate_network_node_key(self, network_id: str) -> str:
         """
         Generate a network-specific key pair for signing network messages.
-        :return: The generated network public key. Private key is not exported.
+        :return: The generated network public key. Private key is not exported,
+            unless local signing is enabled.
         """
-        try:
-            self.client.secrets.transit.create_key(
-                name=f'network-{network_id}',
-                key_type='rsa-4096',
-                mount_point=SERVICE_CONFIG.vault_transit_engine,
-            )
-        except InvalidRequest as e:
-            raise KmsKeyManagementException(
-                f'Unexpected error while generating network key for '
-                f'{network_id} in HashiCorp Vault.',
-            ) from e
-
-        self.client.secrets.transit.update_key_configuration(
-            name=network_id,
-            deletion_allowed=True,
-            mount_point=SERVICE_CONFIG.vault_transit_engine,
+        key_path = f'{SERVICE_CONFIG.vault_transit_engine}/keys/network-{network_id}'
+
+        await self._request(
+            'POST',
+            key_path,
+            not_found_message=f'Unexpected error while generating network key for '
+                              f'{network_id} in HashiCorp Vault.',
+            json={
+                'type': 'rsa-4096',
+                'exportable': SERVICE_CONFIG.vault_local_signing,
+            },
         )
+        await self._request(
+            'POST',
+            f'{key_path}/config',
+            not_found_message=f'Network key {network_id} not found in HashiCorp Vault.',
+            json={'deletion_allowed': True},
+        )
+
+        self._invalidate_public_keys('node', network_id)
+        self._signing_keys.pop(network_id, None)
 
         return await self.get_network_node_public_key(network_id)
 
@@ -146,16 +312,16 @@ class HcvKms(Kms):
         Generate a network management key pair for managing network operations.
         :return: The generated network management private and public key pair.
         """
-        private_key, public_key = self._generate_rsa_key_pair()
+        private_key, public_key = await self._generate_rsa_key_pair()
 
-        self.client.secrets.kv.v2.create_or_update_secret(
-            path=f'{SERVICE_CONFIG.vault_kv_path}/network/{network_id}',
+        await self._write_kv_secret(
+            path=f'network/{network_id}',
             secret={
                 'privateKey': private_key,
                 'publicKey': public_key,
             },
-            mount_point=SERVICE_CONFIG.vault_kv_engine,
         )
+        self._invalidate_public_keys('management', network_id)
 
         return private_key, public_key
 
@@ -176,36 +342,45 @@ class HcvKms(Kms):
         if private_key:
             payload['privateKey'] = private_key
 
-        self.client.secrets.kv.v2.create_or_update_secret(
-            path=f'{SERVICE_CONFIG.vault_kv_path}/network/{network_id}',
+        await self._write_kv_secret(
+            path=f'network/{network_id}',
             secret=payload,
-            mount_point=SERVICE_CONFIG.vault_kv_engine,
         )
+        self._invalidate_public_keys('management', network_id)
 
     async def get_network_node_public_key(self,
                                           network_id: str,
                                           previous_version=False,
                                           ) -> str:
-        return await self._read_transit_public_key(
-            key_name=f'network-{network_id}',
-            previous_version=previous_version,
+        return await self._cached_public_key(
+            ('node', network_id, previous_version),
+            lambda: self._read_transit_public_key(
+                key_name=f'network-{network_id}',
+                previous_version=previous_version,
+            ),
         )
 
     async def get_network_management_public_key(self,
                                                 network_id: str,
                                                 previous_version=False,
                                                 ) -> str:
-        secret_data = await self._read_kv_secret(
-            path=f'{SERVICE_CONFIG.vault_kv_path}/network/{network_id}',
-            previous_version=previous_version,
+        async def _fetch() -> str:
+            secret_data = await self._read_kv_secret(
+                path=f'network/{network_id}',
+                previous_version=previous_version,
+            )
+            return secret_data['publicKey']
+
+        return await self._cached_public_key(
+            ('management', network_id, previous_version),
+            _fetch,
         )
-        return secret_data['publicKey']
 
     async def get_network_management_private_key(self,
                                                  network_id: str,
-                                                 ):
+                                                 ) -> str:
         secret_data = await self._read_kv_secret(
-            path=f'{SERVICE_CONFIG.vault_kv_path}/network/{network_id}',
+            path=f'network/{network_id}',
         )
 
         private_key = secret_data.get('privateKey')
@@ -216,30 +391,94 @@ class HcvKms(Kms):
                 status_code=404,
             )
 
+        return private_key
+
+    async def _get_signing_key(self,
+                               network_id: str,
+                               ) -> RSAPrivateKey | None:
+        """
+        Get the private node key of a network for local signing, exporting
+        it from the Transit engine on first use.
+        :param network_id: The network ID to get the signing key for.
+        :return: The private key, or None if the key cannot be exported.
+        """
+        if network_id in self._signing_keys:
+            return self._signing_keys[network_id]
+
+        try:
+            response = await self._request(
+                'GET',
+                f'{SERVICE_CONFIG.vault_transit_engine}/export/signing-key/'
+                f'network-{network_id}/latest',
+                not_found_message=f'Network key {network_id} not found in HashiCorp Vault.',
+            )
+        except KmsKeyManagementException as e:
+            if e.status_code == 404:
+                raise
+
+            # Keys created before local signing was enabled are not exportable
+            LOGGER.warning(
+                'Unable to export network key %s from HashiCorp Vault, '
+                'signing with Vault instead: %s',
+                network_id,
+                e.message,
+            )
+            self._signing_keys[network_id] = None
+            return None
+
+        private_pem = next(iter(response['data']['keys'].values()))
+        signing_key = serialization.load_pem_private_key(
+            private_pem.encode(),
+            password=None,
+        )
+        self._signing_keys[network_id] = signing_key
+
+        return signing_key
+
+    @staticmethod
+    def _sign_locally(signing_key: RSAPrivateKey,
+                      payload: str,
+                      ) -> str:
+        """
+        Sign a payload in process, the same way the Transit engine does.
+        :param signing_key: The private key to sign with.
+        :param payload: The payload to sign as a string.
+        :return: The base64 encoded signature.
+        """
+        signature = signing_key.sign(
+            payload.encode(),
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA256()),
+                salt_length=padding.PSS.MAX_LENGTH,
+            ),
+            hashes.SHA256(),
+        )
+
+        return base64.b64encode(signature).decode()
+
     async def sign_payload(self,
                            payload: str,
                            network_id: str,
                            ) -> str:
-        try:
-            response = self.client.secrets.transit.sign_data(
-                name=f'network-{network_id}',
-                hash_input=base64.b64encode(payload.encode()).decode(),
-                hash_algorithm='sha2-256',
-                signature_algorithm='pss',
-                salt_length='auto',
-                mount_point=SERVICE_CONFIG.vault_transit_engine,
-            )
+        if SERVICE_CONFIG.vault_local_signing:
+            signing_key = await self._get_signing_key(network_id)
+
+            if signing_key is not None:
+                return await asyncio.to_thread(self._sign_locally, signing_key, payload)
+
+        response = await self._request(
+            'POST',
+            f'{SERVICE_CONFIG.vault_transit_engine}/sign/network-{network_id}',
+            not_found_message=f'Network key {network_id} not found in HashiCorp Vault.',
+            json={
+                'input': base64.b64encode(payload.encode()).decode(),
+                'hash_algorithm': 'sha2-256',
+                'signature_algorithm': 'pss',
+                'salt_length': 'auto',
+            },
+        )
 
-            signature = response['data']['signature']
-            signature = signature.split(':')[-1]
+        signature = response['data']['signature']
+        signature = signature.split(':')[-1]
 
-            return signature
-        except InvalidPath as e:
-            raise KmsKeyManagementException(
-                f'Network key {network_id} not found in HashiCorp Vault.',
-                status_code=404,
-            ) from e
-        except InvalidRequest as e:
-            raise KmsKeyManagementException(
-                f'Error signing payload for network {network_id} in HashiCorp Vault.',
-            ) from e
+        return signature
@@ -6,42 +6,203 @@ data for secure signing and other operations. A new class may implement
 this interface, and map itself to one of the driver options
 """
 
+import asyncio
 import base64
+import time
+from functools import lru_cache
+from typing import Awaitable, Callable
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric.types import PublicKeyTypes
 
-from dedi_gateway.etc.consts import SERVICE_CONFIG
+from dedi_gateway.etc.consts import SERVICE_CONFIG, LOGGER
 from dedi_gateway.etc.errors import ConfigurationParsingException
 
+_PSS = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.MAX_LENGTH,
+)
+_SHA256 = hashes.SHA256()
+
+
+@lru_cache(maxsize=1024)
+def _parse_public_key(public_pem: str) -> PublicKeyTypes:
+    """
+    Parse a PEM encoded public key, caching the result since the same
+    peers' keys are verified against over and over.
+    :param public_pem: The public key in PEM format.
+    :return: The parsed public key.
+    """
+    return serialization.load_pem_public_key(
+        public_pem.encode(),
+    )
+
+
+def _verify_signature(payload: str,
+                      public_pem: str,
+                      signature: str,
+                      ) -> bool:
+    """
+    Verify an RSA-PSS signature over a payload, blocking the calling thread.
+    :param payload: The payload to verify as a string.
+    :param public_pem: The public key to use for verification in PEM format.
+    :param signature: The base64 encoded signature to verify.
+    :return: True if the signature is valid, False otherwise.
+    """
+    public_key = _parse_public_key(public_pem)
+
+    try:
+        public_key.verify(
+            base64.b64decode(signature),
+            payload.encode(),
+            _PSS,
+            _SHA256,
+        )
+        return True
+    except InvalidSignature:
+        return False
+
+
+def _generate_rsa_key_pair() -> tuple[str, str]:
+    """
+    Generate an RSA-4096 key pair, blocking the calling thread.
+    :return: A tuple containing the private key and public key in PEM format.
+    """
+    private_key = rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=4096,
+    )
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+    return private_pem.decode(), public_pem.decode()
+
 
 class Kms:
     """
     Abstract interface for Key Management Service (KMS) operations.
     """
+    __slots__ = ('_public_key_cache', '_public_key_locks')
+
+    _key_pool: asyncio.Queue | None = None
+    _key_pool_refill: asyncio.Task | None = None
+
+    def __init__(self):
+        self._public_key_cache: dict[tuple, tuple[float, str]] = {}
+        self._public_key_locks: dict[tuple, asyncio.Lock] = {}
+
+    async def _cached_public_key(self,
+                                 key: tuple,
+                                 fetch: Callable[[], Awaitable[str]],
+                                 ) -> str:
+        """
+        Get a public key from the cache, fetching it if missing or expired.
+        Concurrent misses for the same key share a single fetch.
+        :param key: The cache key, as (key kind, network ID, previous version).
+        :param fetch: A callable returning a coroutine that reads the key from the backend.
+        :return: The public key in PEM format.
+        """
+        ttl = SERVICE_CONFIG.kms_public_key_ttl
+
+        if ttl <= 0:
+            return await fetch()
+
+        entry = self._public_key_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+        lock = self._public_key_locks.get(key)
+        if lock is None:
+            lock = self._public_key_locks[key] = asyncio.Lock()
+
+        async with lock:
+            # Another caller may have fetched the key while this one waited
+            entry = self._public_key_cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+
+            try:
+                public_key = await fetch()
+                self._public_key_cache[key] = (time.monotonic(), public_key)
+            finally:
+                # Callers still waiting hold the lock already, later ones hit the cache
+                if self._public_key_locks.get(key) is lock:
+                    del self._public_key_locks[key]
+
+        return public_key
+
+    def _invalidate_public_keys(self,
+                                kind: str,
+                                network_id: str,
+                                ):
+        """
+        Drop the cached public keys of a network after its key is rotated.
+        :param kind: The key kind, node or management.
+        :param network_id: The network ID the key belongs to.
+        """
+        for previous_version in (False, True):
+            self._public_key_cache.pop((kind, network_id, previous_version), None)
+
+    @staticmethod
+    async def _refill_key_pool():
+        """
+        Generate key pairs in a worker thread until the pool is full.
+        """
+        try:
+            while not Kms._key_pool.full():
+                key_pair = await asyncio.to_thread(_generate_rsa_key_pair)
+                Kms._key_pool.put_nowait(key_pair)
+        except Exception:
+            LOGGER.exception('Failed to refill the RSA key pool')
+
+    @staticmethod
+    def warm_up_key_pool():
+        """
+        Start filling the pool of pre-generated RSA key pairs in the
+        background, if it is enabled and not already being filled.
+        """
+        pool_size = SERVICE_CONFIG.kms_key_pool_size
+
+        if pool_size <= 0:
+            return
+
+        if Kms._key_pool is None:
+            Kms._key_pool = asyncio.Queue(maxsize=pool_size)
+
+        if Kms._key_pool_refill is None or Kms._key_pool_refill.done():
+            Kms._key_pool_refill = asyncio.create_task(Kms._refill_key_pool())
+
     @staticmethod
-    def _generate_rsa_key_pair() -> tuple[str, str]:
+    async def _generate_rsa_key_pair() -> tuple[str, str]:
         """
-        Utility method to generate an RSA-4096 key pair.
+        Utility method to get an RSA-4096 key pair, from the pre-generated
+        pool if one is ready, or generated in a worker thread otherwise.
         :return: A tuple containing the private key and public key in PEM format.
         """
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=4096,
-        )
-        public_key = private_key.public_key()
+        key_pair = None
 
-        private_pem = private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption(),
-        )
-        public_pem = public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo,
-        )
+        if Kms._key_pool is not None:
+            try:
+                key_pair = Kms._key_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+
+        if key_pair is None:
+            key_pair = await asyncio.to_thread(_generate_rsa_key_pair)
+
+        Kms.warm_up_key_pool()
 
-        return private_pem.decode(), public_pem.decode()
+        return key_pair
 
     @staticmethod
     async def verify_signature(payload: str,
@@ -55,23 +216,8 @@ class Kms:
         :param signature: The signature to verify.
         :return: True if the signature is valid, False otherwise.
         """
-        public_key = serialization.load_pem_public_key(
-            public_pem.encode(),
-        )
-
-        try:
-            public_key.verify(
-                base64.b64decode(signature),
-                payload.encode(),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH,
-                ),
-                hashes.SHA256(),
-            )
-            return True
-        except InvalidSignature:
-            return False
+        # OpenSSL releases the GIL, so verifications also run in parallel
+        return await asyncio.to_thread(_verify_signature, payload, public_pem, signature)
 
     async def generate_network_node_key(self, network_id: str) -> str:
         """
@@ -162,18 +308,22 @@ def get_active_kms() -> Kms | None:
         return _active_kms
 
     if SERVICE_CONFIG.kms_driver == 'vault':
-        from hvac import Client
+        from httpx import AsyncClient, AsyncHTTPTransport, Limits
         from .hashicorp_vault import HcvKms
 
-        vault_client = Client(
-            url=SERVICE_CONFIG.vault_url,
-        )
-        vault_client.auth.approle.login(
-            role_id=SERVICE_CONFIG.vault_role_id,
-            secret_id=SERVICE_CONFIG.vault_secret_id,
-        )
+        # One client, and so one pool of kept-alive connections, for every request
         HcvKms.set_client(
-            client=vault_client,
+            client=AsyncClient(
+                base_url=SERVICE_CONFIG.vault_url,
+                transport=AsyncHTTPTransport(
+                    limits=Limits(
+                        max_connections=256,
+                        max_keepalive_connections=64,
+                        keepalive_expiry=60,
+                    ),
+                    retries=3,
+                ),
+            ),
         )
 
         _active_kms = HcvKms()
@@ -12,12 +12,15 @@ class MemoryKms(Kms):
     This is intended for development and demonstration purposes only.
     Do not use in production.
     """
-    _user_keys: dict = {}
-    _network_node_keys: dict = {}
-    _network_management_keys: dict = {}
+    __slots__ = ('_network_node_keys', '_network_management_keys')
+
+    def __init__(self):
+        super().__init__()
+        self._network_node_keys: dict[str, dict] = {}
+        self._network_management_keys: dict[str, dict] = {}
 
     async def generate_network_node_key(self, network_id: str) -> str:
-        private_key, public_key = self._generate_rsa_key_pair()
+        private_key, public_key = await self._generate_rsa_key_pair()
 
         self._network_node_keys[network_id] = {
             'privateKey': private_key,
@@ -27,7 +30,7 @@ class MemoryKms(Kms):
         return public_key
 
     async def generate_network_management_key(self, network_id: str) -> tuple[str, str]:
-        private_key, public_key = self._generate_rsa_key_pair()
+        private_key, public_key = await self._generate_rsa_key_pair()
 
         self._network_management_keys[network_id] = {
             'privateKey': private_key,
@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+
+class AsyncLimiter:
+    """
+    A leaky bucket rate limiter for coroutines. Bursts up to the maximum
+    rate pass straight through, after which callers wait until enough of
+    the bucket has drained.
+    """
+    def __init__(self,
+                 max_rate: float,
+                 time_period: float = 1.0,
+                 ):
+        """
+        Initialise the AsyncLimiter.
+        :param max_rate: The number of acquisitions allowed per time period.
+        :param time_period: The length of the time period in seconds.
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+
+        self._rate_per_second = max_rate / time_period
+        self._level = 0.0
+        self._last_check = time.monotonic()
+
+    def _leak(self):
+        """
+        Drain the bucket by the time elapsed since the last check.
+        """
+        now = time.monotonic()
+        elapsed = now - self._last_check
+
+        self._level = max(self._level - elapsed * self._rate_per_second, 0.0)
+        self._last_check = now
+
+    async def acquire(self):
+        """
+        Wait until there is capacity in the bucket, then take one unit of it.
+        """
+        while True:
+            self._leak()
+
+            if self._level + 1 <= self.max_rate:
+                self._level += 1
+                return
+
+            await asyncio.sleep((self._level + 1 - self.max_rate) / self._rate_per_second)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
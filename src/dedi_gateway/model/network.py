@@ -1,3 +1,4 @@
+from typing import AsyncIterator
 from dedi_link.model import Network, Node
 
 from .node import NodeRepository
@@ -7,6 +8,8 @@ class NetworkRepository:
     """
     Abstract repository interface for managing networks.
     """
+    __slots__ = ('node_repository',)
+
     def __init__(self, node_repository: NodeRepository):
         """
         Abstract repository interface for managing networks.
@@ -14,10 +17,16 @@ class NetworkRepository:
         """
         self.node_repository = node_repository
 
-    async def get(self, network_id: str) -> Network:
+    async def get(self,
+                  network_id: str,
+                  *,
+                  cached: bool = True,
+                  ) -> Network:
         """
         Retrieve a network by its ID.
         :param network_id: The ID of the network to retrieve.
+        :param cached: Whether a recently read copy may be returned. Pass False
+            where stale membership must not be trusted.
         :return: Network object or None if not found.
         """
         raise NotImplementedError
@@ -35,6 +44,13 @@ class NetworkRepository:
         """
         raise NotImplementedError
 
+    async def iter(self) -> AsyncIterator[Network]:
+        """
+        Iterate over all networks, as the backend produces them.
+        :return: An asynchronous iterator of Network objects.
+        """
+        raise NotImplementedError
+
     async def save(self, network: Network) -> None:
         """
         Save a network to the repository.
@@ -43,6 +59,14 @@ class NetworkRepository:
         """
         raise NotImplementedError
 
+    async def save_many(self, networks: list[Network]) -> None:
+        """
+        Save multiple networks to the repository in one operation.
+        :param networks: List of Network objects to save.
+        :return: None
+        """
+        raise NotImplementedError
+
     async def delete(self, network_id: str) -> None:
         """
         Delete a network by its ID.
@@ -60,7 +60,7 @@ class AuthInterface(NetworkInterface):
         challenge = await self._session.raw_get(
             url=f'{target_url}/service/challenge',
         )
-        challenge_solution = driver.solve(
+        challenge_solution = await driver.solve_async(
             nonce=challenge['nonce'],
             difficulty=challenge['difficulty'],
         )
@@ -135,7 +135,7 @@ class AuthInterface(NetworkInterface):
         challenge = await self._session.raw_get(
             url=f'{target_url}/service/challenge',
         )
-        challenge_solution = driver.solve(
+        challenge_solution = await driver.solve_async(
             nonce=challenge['nonce'],
             difficulty=challenge['difficulty'],
         )
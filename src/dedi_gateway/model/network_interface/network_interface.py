@@ -3,6 +3,7 @@ import socket
 import ipaddress
 import json
 import time
+import uuid
 from urllib.parse import urlparse
 from typing import AsyncGenerator
 import httpx
@@ -36,13 +37,10 @@ async def authenticate_network_message(message: NetworkMessage,
     db = get_active_db()
     kms = get_active_kms()
 
-    # Check if the node is registered and enabled
-    network_nodes = await db.networks.get_nodes(network_id)
-    node = None
-    for n in network_nodes:
-        if n.node_id == sender_id:
-            node = n
-            break
+    # Check if the node is registered and enabled, bypassing the repository
+    # caches so a revoked node is rejected straight away
+    network = await db.networks.get(network_id, cached=False)
+    node = await db.nodes.get(sender_id, cached=False) if sender_id in network.node_ids else None
 
     if not node:
         raise NodeNotFoundException(
@@ -321,14 +319,21 @@ class NetworkInterface:
             LOGGER.info('WebSocket connection established with node %s', node_id)
 
             async def send_loop():
-                while True:
-                    message = await broker.get_message(node_id)
-                    if message:
-                        LOGGER.info('Sending message to node %s with WebSocket', node_id)
-                        LOGGER.debug('Message content: %s', message)
-                        await websocket.send(json.dumps(message))
+                consumer_id = uuid.uuid4().hex
 
-                    await asyncio.sleep(0.1)
+                try:
+                    while True:
+                        message = await broker.get_message(node_id, consumer_id)
+                        if message:
+                            LOGGER.info('Sending message to node %s with WebSocket', node_id)
+                            LOGGER.debug('Message content: %s', message)
+                            await websocket.send(json.dumps(message))
+                            await broker.acknowledge_message(node_id, consumer_id)
+
+                        await asyncio.sleep(0.1)
+                finally:
+                    # Hand an unsent message back for the next connection
+                    await broker.release_consumer(node_id, consumer_id)
 
             async def receive_loop():
                 async for payload in websocket:
@@ -650,17 +655,17 @@ class NetworkInterface:
 
         return sent_messages
 
-async def establish_all_connections():
+async def establish_all_connections(network_interface: NetworkInterface = None):
     """
     Try to establish connections to all nodes known to this service.
+    :param network_interface: The interface to connect through, reused across runs.
     """
     db = get_active_db()
     cache = get_active_cache()
-    network_interface = NetworkInterface()
+    network_interface = network_interface or NetworkInterface()
 
-    networks = await db.networks.filter()
-    for network in networks:
-        nodes = await db.networks.get_nodes(network.network_id)
+    async for network in db.networks.iter():
+        nodes = await db.nodes.batch_get(network.node_ids)
         for node in nodes:
             if not node.approved:
                 continue
@@ -1,3 +1,4 @@
+import asyncio
 from copy import deepcopy
 from dedi_link.etc.enums import SyncRequestType
 from dedi_link.model import NetworkMessage, MessageMetadata, SyncIndex, SyncNode, SyncRequest, \
@@ -24,7 +25,7 @@ class SyncInterface(NetworkInterface):
         db = get_active_db()
         kms = get_active_kms()
         network = await db.networks.get(network_id)
-        known_nodes = await db.networks.get_nodes(network_id)
+        known_nodes = await db.nodes.batch_get(network.node_ids)
 
         # Add this node itself
         known_nodes.append(Node(
@@ -54,6 +55,40 @@ class SyncInterface(NetworkInterface):
             message=sync_message,
         )
 
+    async def _fetch_latest_node(self,
+                                 message: SyncNode,
+                                 existing_node: Node,
+                                 ) -> Node:
+        """
+        Ask a known node for its own latest details.
+        :param message: The SyncNode message that reported the node as changed.
+        :param existing_node: The node as currently stored.
+        :return: The node as reported by itself, keeping the stored approval.
+        """
+        broker = get_active_broker()
+        sync_request = SyncRequest(
+            metadata=MessageMetadata(
+                network_id=message.metadata.network_id,
+                node_id=message.metadata.node_id,
+            ),
+            target=SyncRequestType.INSTANCE,
+        )
+
+        await self.send_message(
+            message=sync_request,
+            node=existing_node,
+        )
+        results = [
+            rsp async for rsp in broker.response_generator(
+                sync_request.metadata.message_id
+            )
+        ]
+        node_sync_response = SyncNode.from_dict(results[0])
+        n = deepcopy(node_sync_response.nodes[0])
+        n.approved = existing_node.approved
+
+        return n
+
     async def process_node_sync_message(self,
                                         message: SyncNode,
                                         ):
@@ -62,9 +97,13 @@ class SyncInterface(NetworkInterface):
         :param message: The SyncNode message containing the nodes to synchronise.
         """
         db = get_active_db()
-        broker = get_active_broker()
-        known_nodes = await db.networks.get_nodes(message.metadata.network_id)
         network = await db.networks.get(message.metadata.network_id)
+        known_nodes = {
+            n.node_id: n for n in await db.nodes.batch_get(network.node_ids)
+        }
+        updated_nodes = []
+        outdated_nodes = []
+        new_nodes = []
 
         for new_node in message.nodes:
             if new_node.node_id == network.instance_id:
@@ -72,45 +111,34 @@ class SyncInterface(NetworkInterface):
                 continue
 
             # Check if the node already exists
-            existing_node = next((n for n in known_nodes if n.node_id == new_node.node_id), None)
+            existing_node = known_nodes.get(new_node.node_id)
             if existing_node and existing_node != new_node:
                 if existing_node.node_id != message.metadata.node_id:
                     # Attempt to retrieve the latest data from that specific node
-                    sync_request = SyncRequest(
-                        metadata=MessageMetadata(
-                            network_id=message.metadata.network_id,
-                            node_id=message.metadata.node_id,
-                        ),
-                        target=SyncRequestType.INSTANCE,
-                    )
-
-                    await self.send_message(
-                        message=sync_request,
-                        node=existing_node,
-                    )
-                    results = [
-                        rsp async for rsp in broker.response_generator(
-                            sync_request.metadata.message_id
-                        )
-                    ]
-                    node_sync_response = SyncNode.from_dict(results[0])
-                    n = deepcopy(node_sync_response.nodes[0])
-                    n.approved = existing_node.approved
+                    outdated_nodes.append(existing_node)
                 else:
                     n = deepcopy(new_node)
                     n.approved = existing_node.approved
-
-                await db.nodes.update(n)
+                    updated_nodes.append(n)
             elif not existing_node:
                 # New node, add it to the database
                 n = deepcopy(new_node)
                 n.approved = False
                 n.data_index = {}
+                new_nodes.append(n)
+
+        # Ask all outdated nodes at once instead of waiting on each in turn
+        updated_nodes.extend(await asyncio.gather(*(
+            self._fetch_latest_node(message, n) for n in outdated_nodes
+        )))
+        await asyncio.gather(*(
+            db.networks.add_node(
+                network_id=message.metadata.network_id,
+                node=n,
+            ) for n in new_nodes
+        ))
 
-                await db.networks.add_node(
-                    network_id=message.metadata.network_id,
-                    node=n,
-                )
+        await db.nodes.update_many(updated_nodes)
 
     async def sync_data_index(self,
                               network_id: str,
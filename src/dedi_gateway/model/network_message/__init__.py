@@ -1,2 +1,2 @@
-from .repository import NetworkMessageRepository
+from .repository import NetworkMessageRepository, STATUS_VALUES
 from .registry import NetworkMessageRegistry
@@ -45,6 +45,7 @@ class MessageConfig:
 class NetworkMessageRegistry:
     _packages = []
     _configurations: dict[str, MessageConfig] = {}
+    _loaded = False
 
     @classmethod
     def load_package(cls, package_path: str):
@@ -87,8 +88,12 @@ class NetworkMessageRegistry:
     @classmethod
     def load_packages(cls):
         """
-        Load package configurations from the data files
+        Load package configurations from the data files. Only the first call
+        reads the files, subsequent calls return immediately.
         """
+        if cls._loaded:
+            return
+
         config_path = pkg_resources.files('dedi_gateway.data.messages')
         for package in config_path.iterdir():
             if package.is_file():
@@ -103,6 +108,8 @@ class NetworkMessageRegistry:
                     if config_id.startswith(proxy_config['messageId']):
                         config.destination = proxy_config['destination']
 
+        cls._loaded = True
+
     def get_configuration(self, config_id: str) -> MessageConfig:
         """
         Get a message configuration by its ID.
@@ -2,11 +2,16 @@ from typing import Mapping, Any
 from dedi_link.etc.enums import AuthMessageStatus
 from dedi_link.model import AuthRequest, AuthInvite
 
+# Stored form of each status, resolved once instead of per query
+STATUS_VALUES: dict[AuthMessageStatus, str] = {s: s.value for s in AuthMessageStatus}
+
 
 class NetworkMessageRepository:
     """
     Abstract repository interface for managing network messages.
     """
+    __slots__ = ()
+
     async def save_sent_request(self,
                                 target_url: str,
                                 request: AuthRequest | AuthInvite,
@@ -5,10 +5,18 @@ class NodeRepository:
     """
     Abstract repository interface for managing nodes.
     """
-    async def get(self, node_id: str) -> Node | None:
+    __slots__ = ()
+
+    async def get(self,
+                  node_id: str,
+                  *,
+                  cached: bool = True,
+                  ) -> Node | None:
         """
         Retrieve a node by its ID.
         :param node_id: The ID of the node to retrieve.
+        :param cached: Whether a recently read copy may be returned. Pass False
+            where a stale approval or key must not be trusted.
         :return: Network object or None if not found.
         """
         raise NotImplementedError
@@ -40,6 +48,14 @@ class NodeRepository:
         """
         raise NotImplementedError
 
+    async def save_many(self, nodes: list[Node]) -> None:
+        """
+        Save multiple nodes to the repository in one operation.
+        :param nodes: List of Node objects to save.
+        :return: None
+        """
+        raise NotImplementedError
+
     async def delete(self, node_id: str) -> None:
         """
         Delete a node by its ID.
@@ -55,3 +71,11 @@ class NodeRepository:
         :return: None
         """
         raise NotImplementedError
+
+    async def update_many(self, nodes: list[Node]) -> None:
+        """
+        Update multiple existing nodes in the repository in one operation.
+        :param nodes: List of Node objects to update.
+        :return: None
+        """
+        raise NotImplementedError
@@ -5,6 +5,8 @@ class UserRepository:
     """
     Abstract repository interface for managing users.
     """
+    __slots__ = ()
+
     async def get(self, user_id: str) -> User | None:
         """
         Retrieve a user by their ID.
@@ -5,7 +5,7 @@ from dedi_link.model import AuthRequest, AuthInvite, CustomMessage, Network
 from dedi_gateway.etc.consts import LOGGER
 from dedi_gateway.etc.errors import MessageBrokerTimeoutException
 from dedi_gateway.etc.utils import exception_handler
-from dedi_gateway.cache import get_active_broker
+from dedi_gateway.cache import get_request_broker
 from dedi_gateway.kms import get_active_kms
 from dedi_gateway.database import get_active_db
 from dedi_gateway.model.network_message import NetworkMessageRegistry
@@ -256,7 +256,7 @@ async def send_message():
         pass
 
     message_registry = NetworkMessageRegistry()
-    broker = get_active_broker()
+    broker = get_request_broker()
     db = get_active_db()
     network_interface = NetworkInterface()
     message_config = message_registry.get_configuration(message_payload['messageType'])
@@ -1,6 +1,7 @@
 import json
 import asyncio
 import secrets
+import uuid
 from copy import deepcopy
 from quart import Blueprint, Response, request, websocket, abort
 from dedi_link.etc.enums import MessageType, AuthMessageStatus, ConnectivityType, TransportType
@@ -10,7 +11,7 @@ from dedi_link.model import AuthRequest, AuthInvite, AuthRequestResponse, AuthIn
 from dedi_gateway.etc.consts import SERVICE_CONFIG, LOGGER
 from dedi_gateway.etc.powlib import PowDriver
 from dedi_gateway.etc.utils import exception_handler
-from dedi_gateway.cache import get_active_broker, get_active_cache
+from dedi_gateway.cache import get_request_broker, get_active_cache
 from dedi_gateway.database import get_active_db
 from dedi_gateway.kms import get_active_kms
 from dedi_gateway.model.route import Route
@@ -424,7 +425,7 @@ async def service_websocket():
     WebSocket endpoint for server-to-server communication.
     Accepts functional messages from other servers.
     """
-    broker = get_active_broker()
+    broker = get_request_broker()
     cache = get_active_cache()
 
     try:
@@ -463,43 +464,59 @@ async def service_websocket():
     )
 
     async def send_loop():
-        while True:
-            try:
-                message = await broker.get_message(auth_connect_message.metadata.node_id)
+        consumer_id = uuid.uuid4().hex
 
-                if not message:
-                    # Ping the client and wait for pong
-                    pong_event.clear()
-                    LOGGER.debug(
-                        'Pinging client for node %s',
-                        auth_connect_message.metadata.node_id
+        try:
+            while True:
+                try:
+                    message = await broker.get_message(
+                        auth_connect_message.metadata.node_id,
+                        consumer_id,
                     )
-                    await websocket.send(json.dumps({'ping': True}))
 
-                    try:
-                        await asyncio.wait_for(pong_event.wait(), timeout=10)
-                    except asyncio.TimeoutError:
-                        await websocket.send(json.dumps({'error': 'Pong timeout'}))
-                        abort(408, 'Client did not respond to ping')
-                else:
-                    await pong_event.wait()
+                    if not message:
+                        # Ping the client and wait for pong
+                        pong_event.clear()
+                        LOGGER.debug(
+                            'Pinging client for node %s',
+                            auth_connect_message.metadata.node_id
+                        )
+                        await websocket.send(json.dumps({'ping': True}))
+
+                        try:
+                            await asyncio.wait_for(pong_event.wait(), timeout=10)
+                        except asyncio.TimeoutError:
+                            await websocket.send(json.dumps({'error': 'Pong timeout'}))
+                            abort(408, 'Client did not respond to ping')
+                    else:
+                        await pong_event.wait()
+                        LOGGER.info(
+                            'Sending message %s to node %s',
+                            message['message']['metadata']['messageId'],
+                            auth_connect_message.metadata.node_id
+                        )
+                        LOGGER.debug('Message content: %s', message)
+                        await websocket.send(json.dumps(message))
+                        await broker.acknowledge_message(
+                            auth_connect_message.metadata.node_id,
+                            consumer_id,
+                        )
+
+                    await asyncio.sleep(0.1)
+                except asyncio.CancelledError:
                     LOGGER.info(
-                        'Sending message %s to node %s',
-                        message['message']['metadata']['messageId'],
+                        'Send loop cancelled for node %s',
                         auth_connect_message.metadata.node_id
                     )
-                    LOGGER.debug('Message content: %s', message)
-                    await websocket.send(json.dumps(message))
-
-                await asyncio.sleep(0.1)
-            except asyncio.CancelledError:
-                LOGGER.info(
-                    'Send loop cancelled for node %s',
-                    auth_connect_message.metadata.node_id
-                )
-                raise
-            except Exception:
-                abort(500, 'An error occurred while processing the message.')
+                    raise
+                except Exception:
+                    abort(500, 'An error occurred while processing the message.')
+        finally:
+            # Hand an unsent message back for the next connection
+            await broker.release_consumer(
+                auth_connect_message.metadata.node_id,
+                consumer_id,
+            )
 
     async def receive_loop():
         while True:
@@ -643,10 +660,15 @@ async def handle_sse():
     )
 
     async def event_stream():
-        broker = get_active_broker()
+        broker = get_request_broker()
+        consumer_id = uuid.uuid4().hex
+
         try:
             while True:
-                message = await broker.get_message(auth_connect_message.metadata.node_id)
+                message = await broker.get_message(
+                    auth_connect_message.metadata.node_id,
+                    consumer_id,
+                )
 
                 if message:
                     LOGGER.info(
@@ -655,6 +677,10 @@ async def handle_sse():
                         auth_connect_message.metadata.node_id
                     )
                     yield f"data: {json.dumps(message)}\n\n"
+                    await broker.acknowledge_message(
+                        auth_connect_message.metadata.node_id,
+                        consumer_id,
+                    )
                 else:
                     # Ping the client and wait for pong
                     LOGGER.debug(
@@ -682,6 +708,11 @@ async def handle_sse():
                 'Node %s disconnected from SSE event stream',
                 auth_connect_message.metadata.node_id
             )
+            # Hand an unsent message back for the next connection
+            await broker.release_consumer(
+                auth_connect_message.metadata.node_id,
+                consumer_id,
+            )
             await cache.delete_route(
                 node_id=auth_connect_message.metadata.node_id,
             )
@@ -0,0 +1,139 @@
+import uuid
+import asyncio
+from collections import OrderedDict
+import fakeredis
+import pytest
+
+from dedi_gateway.cache.memory import MemoryMessageBroker
+from dedi_gateway.cache.redis_driver import RedisMessageBroker
+
+
+@pytest.fixture
+def node_id() -> str:
+    return uuid.uuid4().hex
+
+
+@pytest.fixture
+def memory_broker() -> MemoryMessageBroker:
+    broker = MemoryMessageBroker()
+    broker.DRIVER_TIMEOUT = 0.1
+
+    return broker
+
+
+@pytest.fixture
+def redis_broker() -> RedisMessageBroker:
+    RedisMessageBroker.set_client(fakeredis.FakeAsyncRedis(decode_responses=True))
+    broker = RedisMessageBroker()
+    broker.DRIVER_TIMEOUT = 1
+
+    return broker
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def broker(request, memory_broker, redis_broker):
+    if request.param == 'memory':
+        return memory_broker
+
+    return redis_broker
+
+
+class TestMessageBroker:
+    async def test_unacknowledged_message_is_redelivered(self, broker, node_id):
+        await broker.publish_message(node_id, {'id': 1})
+
+        assert await broker.get_message(node_id, 'consumer') == {'id': 1}
+        assert await broker.get_message(node_id, 'consumer') == {'id': 1}
+
+        await broker.acknowledge_message(node_id, 'consumer')
+
+        assert await broker.get_message(node_id, 'consumer') is None
+
+    async def test_consumers_do_not_share_in_flight_messages(self, broker, node_id):
+        await broker.publish_message(node_id, {'id': 1})
+        await broker.publish_message(node_id, {'id': 2})
+
+        first = await broker.get_message(node_id, 'first')
+        second = await broker.get_message(node_id, 'second')
+
+        assert first != second
+        assert {first['id'], second['id']} == {1, 2}
+
+        # Acknowledging one consumer's message leaves the other in flight
+        await broker.acknowledge_message(node_id, 'first')
+
+        assert await broker.get_message(node_id, 'second') == second
+        assert await broker.get_message(node_id, 'first') is None
+
+    async def test_released_message_goes_to_next_consumer(self, broker, node_id):
+        await broker.publish_message(node_id, {'id': 1})
+
+        assert await broker.get_message(node_id, 'first') == {'id': 1}
+
+        await broker.release_consumer(node_id, 'first')
+
+        assert await broker.get_message(node_id, 'second') == {'id': 1}
+        await broker.acknowledge_message(node_id, 'second')
+
+        assert await broker.get_message(node_id, 'first') is None
+
+
+class TestMemoryMessageBroker:
+    async def test_response_queues_are_evicted_least_recently_used(self,
+                                                                   memory_broker,
+                                                                   monkeypatch,
+                                                                   ):
+        monkeypatch.setattr(MemoryMessageBroker, '_responses', OrderedDict())
+        monkeypatch.setattr(MemoryMessageBroker, 'MAX_INFLIGHT_RESPONSES', 3)
+
+        # A generator waiting on its responses keeps its queue, however old it is
+        generator = memory_broker.response_generator('awaited')
+        waiting = asyncio.ensure_future(anext(generator))
+        await asyncio.sleep(0)
+
+        await memory_broker.add_to_response({'metadata': {'messageId': 'first'}})
+        await memory_broker.add_to_response({'metadata': {'messageId': 'second'}})
+        await memory_broker.add_to_response({'metadata': {'messageId': 'first'}})
+        await memory_broker.add_to_response({'metadata': {'messageId': 'third'}})
+
+        assert list(MemoryMessageBroker._responses) == ['awaited', 'first', 'third']
+
+        response = {'metadata': {'messageId': 'awaited'}}
+        await memory_broker.add_to_response(response)
+
+        assert await waiting == response
+        await generator.aclose()
+
+
+class TestRedisMessageBroker:
+    async def test_acknowledge_removes_exact_message(self, redis_broker, node_id):
+        await redis_broker.publish_message(node_id, {'id': 1})
+        await redis_broker.get_message(node_id, 'consumer')
+        await redis_broker.acknowledge_message(node_id, 'consumer')
+
+        processing = await redis_broker.db.lrange(
+            f'message:node:{node_id}:processing:consumer', 0, -1
+        )
+
+        assert processing == []
+
+    async def test_abandoned_consumer_is_recovered(self, redis_broker, node_id):
+        await redis_broker.publish_message(node_id, {'id': 1})
+        assert await redis_broker.get_message(node_id, 'dead') == {'id': 1}
+
+        # A worker that died never releases its consumer, its lease expires instead
+        await redis_broker.db.delete(f'message:node:{node_id}:lease:dead')
+
+        other_worker = RedisMessageBroker()
+        other_worker.DRIVER_TIMEOUT = 1
+
+        assert await other_worker.get_message(node_id, 'alive') == {'id': 1}
+
+    async def test_live_consumer_is_not_recovered(self, redis_broker, node_id):
+        await redis_broker.publish_message(node_id, {'id': 1})
+        assert await redis_broker.get_message(node_id, 'first') == {'id': 1}
+
+        other_worker = RedisMessageBroker()
+        other_worker.DRIVER_TIMEOUT = 1
+
+        assert await other_worker.get_message(node_id, 'second') is None
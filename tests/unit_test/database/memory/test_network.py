@@ -0,0 +1,40 @@
+from dedi_gateway.database.memory.network import MemoryNetworkRepository
+from dedi_gateway.database.memory.node import MemoryNodeRepository
+from dedi_gateway.model.network import Network
+
+
+def _network(network_id: str, visible: bool, registered: bool) -> Network:
+    return Network(
+        network_id=network_id,
+        network_name=network_id,
+        visible=visible,
+        registered=registered,
+    )
+
+
+class TestMemoryNetworkRepository:
+    async def test_filter_follows_writes(self):
+        repository = MemoryNetworkRepository(
+            {'existing': _network('existing', True, True)},
+            MemoryNodeRepository({}),
+        )
+        await repository.save_many([
+            _network('hidden', False, True),
+            _network('public', True, False),
+        ])
+
+        async def network_ids(**kwargs) -> list[str]:
+            return [n.network_id for n in await repository.filter(**kwargs)]
+
+        assert await network_ids(visible=True) == ['existing', 'public']
+        assert await network_ids(registered=True) == ['existing', 'hidden']
+        assert await network_ids(visible=True, registered=True) == ['existing']
+
+        # Updates keep the network's place in buckets it was already in
+        await repository.save(_network('late', True, True))
+        await repository.update(_network('hidden', True, True))
+        await repository.delete('existing')
+
+        assert await network_ids(registered=True) == ['hidden', 'late']
+        assert await network_ids(visible=True, registered=True) == ['late', 'hidden']
+        assert await network_ids(visible=False) == []
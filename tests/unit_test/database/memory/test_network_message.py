@@ -0,0 +1,57 @@
+from dedi_link.etc.enums import AuthMessageStatus
+from dedi_link.model import AuthRequest, MessageMetadata, Node
+
+from dedi_gateway.database.memory.network_message import MemoryNetworkMessageRepository
+
+
+def _auth_request(message_id: str) -> AuthRequest:
+    return AuthRequest(
+        metadata=MessageMetadata(
+            network_id='network',
+            node_id='node',
+            message_id=message_id,
+        ),
+        node=Node(
+            node_id='node',
+            node_name='Node',
+            url='http://node.test',
+            description='',
+        ),
+        challenge_nonce='nonce',
+        challenge_solution=1,
+    )
+
+
+class TestMemoryNetworkMessageRepository:
+    async def test_held_request_survives_replacement(self):
+        repository = MemoryNetworkMessageRepository({})
+        await repository.save_received_request(_auth_request('message'))
+
+        held = await repository.get_received_request('message')
+        await repository.save_received_request(_auth_request('message'))
+
+        assert held['request']['metadata']['messageId'] == 'message'
+        assert held['status'] == 'pending'
+
+    async def test_held_request_survives_eviction(self, monkeypatch):
+        monkeypatch.setattr(MemoryNetworkMessageRepository, 'MAX_STORED_REQUESTS', 1)
+        repository = MemoryNetworkMessageRepository({})
+        await repository.save_received_request(_auth_request('first'))
+
+        held = await repository.get_received_request('first')
+        await repository.save_received_request(_auth_request('second'))
+
+        assert 'first' not in repository.db['receivedRequests']
+        assert held['request']['metadata']['messageId'] == 'first'
+
+    async def test_get_requests_filters_by_status(self):
+        repository = MemoryNetworkMessageRepository({})
+        await repository.save_received_request(_auth_request('received'))
+        await repository.save_sent_request('http://node.test', _auth_request('sent'))
+        await repository.update_request_status('sent', AuthMessageStatus.ACCEPTED)
+
+        pending = await repository.get_requests(status=[AuthMessageStatus.PENDING])
+        sent = await repository.get_requests(sent=True)
+
+        assert [r['request']['metadata']['messageId'] for r in pending] == ['received']
+        assert [r['targetUrl'] for r in sent] == ['http://node.test']
@@ -0,0 +1,44 @@
+from dedi_link.model import Node
+
+from dedi_gateway.database.memory.node import MemoryNodeRepository
+
+
+def _node(node_id: str, approved: bool) -> Node:
+    return Node(
+        node_id=node_id,
+        node_name=node_id,
+        url=f'http://{node_id}.test',
+        description='',
+        approved=approved,
+    )
+
+
+class TestMemoryNodeRepository:
+    async def test_filter_follows_writes(self):
+        repository = MemoryNodeRepository({'existing': _node('existing', True)})
+        await repository.save_many([_node('first', False), _node('second', True)])
+
+        assert [n.node_id for n in await repository.filter(approved=True)] == [
+            'existing', 'second',
+        ]
+
+        await repository.update(_node('first', True))
+        await repository.delete('existing')
+
+        # An approval change moves the node to the end of its new bucket
+        assert [n.node_id for n in await repository.filter(approved=True)] == [
+            'second', 'first',
+        ]
+        assert await repository.filter(approved=False) == []
+
+    async def test_filter_follows_in_place_update(self):
+        node = _node('node', False)
+        repository = MemoryNodeRepository({})
+        await repository.save(node)
+
+        # Callers may change the stored object itself before updating it
+        node.approved = True
+        await repository.update(node)
+
+        assert await repository.filter(approved=True) == [node]
+        assert await repository.filter(approved=False) == []
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from pymongo.errors import BulkWriteError, WriteError
+
+from dedi_gateway.database.mongo_driver.batch_writer import AsyncBatchWriter
+
+
+class FakeCollection:
+    def __init__(self, duplicate_indexes: tuple[int, ...] = ()):
+        self.batches = []
+        self.duplicate_indexes = duplicate_indexes
+
+    async def insert_many(self, documents: list[dict], ordered: bool = True):
+        self.batches.append(documents)
+
+        if self.duplicate_indexes:
+            raise BulkWriteError({
+                'writeErrors': [
+                    {'index': index, 'code': 11000, 'errmsg': 'duplicate key'}
+                    for index in self.duplicate_indexes
+                ],
+            })
+
+
+class HangingCollection:
+    async def insert_many(self, documents: list[dict], ordered: bool = True):
+        await asyncio.Event().wait()
+
+
+class TestAsyncBatchWriter:
+    async def test_inserts_are_coalesced(self):
+        collection = FakeCollection()
+        writer = AsyncBatchWriter(collection, flush_interval=0.01)
+
+        await asyncio.gather(*(writer.insert({'id': i}) for i in range(3)))
+
+        assert collection.batches == [[{'id': 0}, {'id': 1}, {'id': 2}]]
+
+    async def test_full_batch_is_written_without_waiting(self):
+        collection = FakeCollection()
+        writer = AsyncBatchWriter(collection, batch_size=2, flush_interval=60)
+
+        await asyncio.gather(writer.insert({'id': 0}), writer.insert({'id': 1}))
+
+        assert collection.batches == [[{'id': 0}, {'id': 1}]]
+
+    async def test_flush_writes_pending_documents(self):
+        collection = FakeCollection()
+        writer = AsyncBatchWriter(collection, flush_interval=60)
+
+        future = writer.insert({'id': 0})
+        await writer.flush()
+
+        assert future.done()
+        assert collection.batches == [[{'id': 0}]]
+
+    async def test_only_failed_documents_raise(self):
+        collection = FakeCollection(duplicate_indexes=(1,))
+        writer = AsyncBatchWriter(collection, flush_interval=0.01)
+
+        first, second = writer.insert({'id': 0}), writer.insert({'id': 1})
+
+        assert await first is None
+
+        with pytest.raises(WriteError):
+            await second
+
+    async def test_cancelled_write_cancels_callers(self):
+        writer = AsyncBatchWriter(HangingCollection(), flush_interval=0)
+        future = writer.insert({'id': 0})
+        await asyncio.sleep(0.01)
+
+        # Cancel the in-flight write, as happens when the loop shuts down
+        for task in list(writer._writes):
+            task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await future
@@ -0,0 +1,53 @@
+import asyncio
+from dedi_gateway.database.mongo_driver import cursor as cursor_module
+from dedi_gateway.database.mongo_driver.cursor import load_all, prefetch
+
+
+class FakeCursor:
+    def __init__(self, documents: list[dict]):
+        self.documents = documents
+        self.fetched = 0
+        self.size = None
+
+    def batch_size(self, size: int):
+        self.size = size
+
+    async def to_list(self, length: int) -> list[dict]:
+        batch = self.documents[self.fetched:self.fetched + length]
+        self.fetched += len(batch)
+
+        return batch
+
+
+class TestPrefetch:
+    async def test_yields_every_document_in_order(self):
+        documents = [{'id': i} for i in range(5)]
+        cursor = FakeCursor(documents)
+
+        assert [d async for d in prefetch(cursor, batch_size=2)] == documents
+        assert cursor.size == 2
+
+    async def test_next_batch_is_fetched_while_consuming(self):
+        cursor = FakeCursor([{'id': i} for i in range(4)])
+        generator = prefetch(cursor, batch_size=2)
+
+        await anext(generator)
+        await anext(generator)
+        await asyncio.sleep(0)
+
+        # By the end of the first batch, the second one has been requested too
+        assert cursor.fetched == 4
+
+        await generator.aclose()
+
+
+class TestLoadAll:
+    async def test_builds_models_in_order(self, monkeypatch):
+        documents = [{'id': i} for i in range(5)]
+
+        assert await load_all(documents, lambda d: d['id']) == [0, 1, 2, 3, 4]
+
+        # Large lists are built in a worker thread, still in order
+        monkeypatch.setattr(cursor_module, 'OFFLOAD_THRESHOLD', 2)
+
+        assert await load_all(documents, lambda d: d['id']) == [0, 1, 2, 3, 4]
@@ -0,0 +1,19 @@
+from dedi_link.model import Network
+
+from dedi_gateway.database.mongo_driver.network import MongoNetworkRepository
+from dedi_gateway.database.mongo_driver.node import MongoNodeRepository
+from .test_node import FakeCollection
+
+
+class TestMongoNetworkRepository:
+    async def test_unchanged_network_is_still_written(self):
+        network = Network(network_id='network', network_name='Network')
+        collection = FakeCollection(network.to_dict())
+        repository = MongoNetworkRepository(
+            {'networks': collection},
+            MongoNodeRepository({'nodes': FakeCollection({})}),
+        )
+
+        await repository.update(await repository.get('network'))
+
+        assert len(collection.writes) == 1
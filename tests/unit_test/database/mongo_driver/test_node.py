@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+from dedi_link.model import Node
+
+from dedi_gateway.database.mongo_driver.node import MongoNodeRepository
+
+
+class FakeCollection:
+    def __init__(self, document: dict):
+        self.document = document
+        self.writes = []
+
+    async def find_one(self, query: dict, projection: dict) -> dict:
+        return dict(self.document)
+
+    async def update_one(self, query: dict, update: dict):
+        self.writes.append(update)
+
+        return SimpleNamespace(matched_count=1)
+
+    async def bulk_write(self, requests: list, ordered: bool = True):
+        self.writes.extend(requests)
+
+        return SimpleNamespace(matched_count=len(requests))
+
+
+class TestMongoNodeRepository:
+    async def test_unchanged_node_is_still_written(self):
+        node = Node(node_id='node', node_name='Node', url='http://node.test', description='')
+        collection = FakeCollection(node.to_dict())
+        repository = MongoNodeRepository({'nodes': collection})
+
+        # The cached copy matches, but another worker may have changed the document
+        cached = await repository.get('node')
+        await repository.update(cached)
+        await repository.update_many([cached])
+
+        assert len(collection.writes) == 2
@@ -0,0 +1,39 @@
+import time
+
+from dedi_gateway.database.mongo_driver.repository_cache import RepositoryCache
+
+
+class TestRepositoryCache:
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        now = time.monotonic()
+        monkeypatch.setattr(time, 'monotonic', lambda: now)
+        cache = RepositoryCache(ttl=30)
+        cache.put('key', {'value': 1})
+
+        monkeypatch.setattr(time, 'monotonic', lambda: now + 29)
+        assert cache.get('key') == {'value': 1}
+
+        monkeypatch.setattr(time, 'monotonic', lambda: now + 31)
+        assert cache.get('key') is None
+
+    def test_cached_documents_are_isolated(self):
+        cache = RepositoryCache()
+        document = {'nodeIds': ['first']}
+        cache.put('key', document)
+
+        # Neither the stored document nor a returned copy leak into the cache
+        document['nodeIds'].append('second')
+        cache.get('key')['nodeIds'].append('third')
+
+        assert cache.get('key') == {'nodeIds': ['first']}
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = RepositoryCache(max_size=2)
+        cache.put('first', {})
+        cache.put('second', {})
+
+        cache.get('first')
+        cache.put('third', {})
+
+        assert cache.get('second') is None
+        assert cache.get('first') == {}
@@ -1,4 +1,5 @@
 from dedi_gateway.etc.powlib import PowDriver
+from dedi_gateway.etc.powlib.powlib import _VALIDATE_POW
 
 
 class TestPowDriver:
@@ -20,3 +21,13 @@ class TestPowDriver:
         is_valid = driver.validate(nonce, difficulty, response)
 
         assert is_valid is True
+
+    def test_validate_native(self):
+        nonce = 'dfe041b4f60cb54d082e542b109e392a'
+        difficulty = 22
+
+        # The shipped library must export validate_pow, not just solve_pow
+        assert _VALIDATE_POW is not None
+
+        assert _VALIDATE_POW(nonce.encode('utf-8'), difficulty, 9642966) == 1
+        assert _VALIDATE_POW(nonce.encode('utf-8'), difficulty, 9642967) == 0
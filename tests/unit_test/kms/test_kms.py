@@ -0,0 +1,27 @@
+import asyncio
+
+from dedi_gateway.kms.kms import Kms
+
+
+class TestKms:
+    async def test_concurrent_misses_share_one_fetch(self):
+        kms = Kms()
+        fetches = []
+
+        async def fetch() -> str:
+            fetches.append(None)
+            await asyncio.sleep(0.01)
+
+            return 'public-key'
+
+        keys = await asyncio.gather(
+            *(kms._cached_public_key(('node', 'network', False), fetch) for _ in range(5))
+        )
+
+        assert keys == ['public-key'] * 5
+        assert len(fetches) == 1
+
+        # The lock is only kept while a fetch is in flight
+        assert not kms._public_key_locks
+        assert await kms._cached_public_key(('node', 'network', False), fetch) == 'public-key'
+        assert len(fetches) == 1
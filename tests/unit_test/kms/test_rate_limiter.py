@@ -0,0 +1,21 @@
+import time
+
+from dedi_gateway.kms.rate_limiter import AsyncLimiter
+
+
+class TestAsyncLimiter:
+    async def test_burst_passes_then_waits(self):
+        limiter = AsyncLimiter(max_rate=5, time_period=1)
+
+        start = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire()
+        burst = time.monotonic() - start
+
+        async with limiter:
+            pass
+        waited = time.monotonic() - start
+
+        # The sixth acquisition has to wait for one unit, 0.2 seconds, to drain
+        assert burst < 0.1
+        assert waited >= 0.15